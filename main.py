@@ -5,26 +5,40 @@
 提供命令行介面和OSC網絡控制
 """
 import sys
-import time
 import argparse
 import logging
 import logging.handlers
 import signal
 import os
-import asyncio
+import threading
+import dataclasses
+import json
 
 # 將專案根目錄添加到路徑，以便正確導入模組
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# 從套件中導入需要的模組
-from modbus_encoder.controllers.main_controller import MainController
-from modbus_encoder.utils.config import ConfigManager
+# 嘗試導入 orjson 以加速 JSON 序列化，若不可用則使用標準庫
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+# 嘗試導入 readline，為互動模式的 input() 提供行編輯與歷史記錄（Windows 上不可用）
+try:
+    import readline  # noqa: F401
+except ImportError:
+    pass
 
 # 全局變量
-running = True
 controller = None
+stop_event = threading.Event()  # 全局停止旗標，信號處理與各模式共用
 logger = logging.getLogger(__name__)
 
+# 監測資料文本輸出模板（只解析一次格式字符串）
+MONITOR_TEXT_TEMPLATE = "{0.address},{0.timestamp:.3f},{0.direction},{0.angle:.4f},{0.rpm:.4f},{0.laps},{0.raw_angle},{0.raw_rpm}"
+
 # 處理系統信號
 def signal_handler(sig, frame):
     """處理系統信號（如Ctrl+C）
@@ -33,9 +47,8 @@ def signal_handler(sig, frame):
         sig: 信號
         frame: 框架
     """
-    global running
     print("\n接收到終止信號，正在關閉系統...")
-    running = False
+    stop_event.set()
 
 # 註冊信號處理器
 signal.signal(signal.SIGINT, signal_handler)
@@ -47,6 +60,8 @@ def setup_logging(debug=False):
     Args:
         debug: 是否啟用調試模式
     """
+    from modbus_encoder.utils.config import ConfigManager
+    
     log_level = logging.DEBUG if debug else logging.INFO
     
     # 讀取配置
@@ -75,14 +90,17 @@ def setup_logging(debug=False):
 
 def interactive_mode():
     """互動式命令行模式"""
-    global running, controller
+    global controller
     
     # 歡迎消息
     print("\n===== 編碼器控制系統（互動模式）=====")
     print("輸入 'help' 獲取命令列表，'exit' 退出程式")
     
+    # 預先綁定命令處理方法
+    handle = controller.handle_command
+    
     # 命令處理循環
-    while running:
+    while not stop_event.is_set():
         try:
             # 獲取命令
             cmd = input("\n> ").strip()
@@ -90,28 +108,27 @@ def interactive_mode():
             if not cmd:
                 continue
                 
-            if cmd.lower() == "exit":
-                running = False
+            low = cmd.lower()
+            if low == "exit":
+                stop_event.set()
                 print("正在退出...")
                 break
-            elif cmd.lower() == "help":
+            elif low == "help":
                 print_help()
             else:
                 # 處理命令
-                result = controller.handle_command(cmd, "CLI")
+                result = handle(cmd, "CLI")
                 print_result(result)
                 
         except KeyboardInterrupt:
-            running = False
+            stop_event.set()
             print("\n正在退出...")
             break
         except Exception as e:
             print(f"出錯: {e}")
 
-def print_help():
-    """打印幫助信息"""
-    print("\n=== 命令列表 ===")
-    
+def _build_help_text():
+    """構建幫助信息文本（模組載入時執行一次）"""
     categories = {
         "系統命令": {
             "help": "顯示幫助信息",
@@ -138,14 +155,23 @@ def print_help():
         }
     }
     
+    lines = ["", "=== 命令列表 ==="]
     for category, commands in categories.items():
-        print(f"\n【{category}】")
+        lines.append(f"\n【{category}】")
         for cmd, desc in commands.items():
-            print(f"  {cmd:<20} - {desc}")
+            lines.append(f"  {cmd:<20} - {desc}")
             
-    print("\n例如: connect port=/dev/ttyUSB0 baudrate=9600 address=1")
-    print("例如: read_position")
-    print("例如: gpio_high pin=0")
+    lines.append("\n例如: connect port=/dev/ttyUSB0 baudrate=9600 address=1")
+    lines.append("例如: read_position")
+    lines.append("例如: gpio_high pin=0")
+    return "\n".join(lines) + "\n"
+
+# 幫助信息為靜態內容，只構建一次
+_HELP_TEXT = _build_help_text()
+
+def print_help():
+    """打印幫助信息"""
+    sys.stdout.write(_HELP_TEXT)
 
 def print_result(result):
     """打印命令處理結果
@@ -154,38 +180,68 @@ def print_result(result):
         result: 命令處理結果
     """
     if isinstance(result, dict):
-        # 格式化JSON結果
-        import json
+        # 格式化JSON結果，orjson 可用且 stdout 有底層緩衝區時直接輸出UTF-8位元組
+        # （stdout 被替換為 StringIO 等文本流時沒有 buffer 屬性）
+        buffer = getattr(sys.stdout, "buffer", None)
+        if ORJSON_AVAILABLE and buffer is not None:
+            try:
+                payload = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                sys.stdout.flush()
+                buffer.write(payload + b"\n")
+                buffer.flush()
+                return
+            except TypeError:
+                pass
         print(json.dumps(result, indent=2, ensure_ascii=False))
     else:
         print(result)
 
-async def async_mode():
-    """非同步模式運行"""
-    global running, controller
+async def wait_for_stop_signal():
+    """在事件循環中等待終止信號
     
-    try:
-        # 創建事件循環
-        loop = asyncio.get_event_loop()
-        
-        # 建立終止處理
-        stop_event = asyncio.Event()
+    同時設置全局停止事件，讓同步路徑與非同步路徑共用同一終止狀態
+    """
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    
+    # 建立終止處理
+    async_stop_event = asyncio.Event()
+    
+    # 終止信號處理
+    def handle_signal():
+        logger.info("接收到終止信號，正在關閉系統...")
+        stop_event.set()
+        async_stop_event.set()
         
-        # 終止信號處理
-        def handle_signal():
-            logger.info("接收到終止信號，正在關閉系統...")
-            stop_event.set()
-            
-        # 註冊信號處理
+    # 註冊信號處理
+    try:
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, handle_signal)
-            
+    except NotImplementedError:
+        # Windows 的事件循環不支持 add_signal_handler，沿用模組層級以 signal.signal 註冊的處理器，
+        # 在執行器線程中等待全局停止事件
+        if not stop_event.is_set():
+            await loop.run_in_executor(None, stop_event.wait)
+        return
+        
+    # 信號可能在事件循環啟動前已到達
+    if stop_event.is_set():
+        return
+        
+    await async_stop_event.wait()
+
+async def async_mode():
+    """非同步模式運行"""
+    global controller
+    
+    try:
         # 等待停止事件
         try:
             logger.info("系統已啟動（非同步模式），按Ctrl+C停止...")
             
             # 等待停止事件
-            await stop_event.wait()
+            await wait_for_stop_signal()
             
         finally:
             # 使用異步方式關閉系統
@@ -197,6 +253,15 @@ async def async_mode():
         logger.exception(f"非同步模式運行出錯: {e}")
         return 1
 
+async def service_mode():
+    """服務模式運行
+    
+    由事件循環等待終止信號，取代每秒喚醒一次的阻塞輪詢，
+    OSC 收發由各自的線程處理，不受主循環阻塞影響
+    """
+    print("編碼器控制系統已啟動，按Ctrl+C停止...")
+    await wait_for_stop_signal()
+
 def handle_monitor_command(args):
     """處理監測命令"""
     global controller
@@ -213,39 +278,77 @@ def handle_monitor_command(args):
     print(f"開始監測編碼器資料 (間隔: {interval}秒, 格式: {format_type})")
     print("按 Ctrl+C 停止...")
     
+    # 預先綁定格式化方法，避免每個樣本重複查找屬性
+    format_text = MONITOR_TEXT_TEMPLATE.format
+    
+    # 直接寫入 stdout 的底層緩衝區，按批次刷新，輸出延遲保持在約0.5秒內
+    sys.stdout.flush()
+    out = getattr(sys.stdout, "buffer", None)
+    if out is not None:
+        write = out.write
+    else:
+        # stdout 被替換為沒有底層緩衝區的文本流時，解碼後寫入文本流
+        out = sys.stdout
+        
+        def write(payload):
+            out.write(payload.decode("utf-8"))
+            
+    flush_every = max(1, int(0.5 / interval)) if interval > 0 else 1
+    pending = 0
+    
     # 資料接收回調
     def data_callback(data):
+        nonlocal pending
+        
         if format_type == "json":
-            import json
-            print(json.dumps(data, ensure_ascii=False))
+            if ORJSON_AVAILABLE:
+                # orjson 可直接序列化數據類，無需先轉為字典
+                payload = orjson.dumps(data) + b"\n"
+            else:
+                payload = (json.dumps(data.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
         else:
+            # 速度讀取失敗時以 0 輸出，不修改其他監聽器共用的資料樣本
+            if data.rpm is None or data.raw_rpm is None:
+                data = dataclasses.replace(data, rpm=data.rpm or 0, raw_rpm=data.raw_rpm or 0)
+                
             # 構建文本格式輸出
-            output = f"{data['address']},{data['timestamp']:.3f},{data['direction']},{data['angle']:.4f},{data['rpm'] if data['rpm'] is not None else 0:.4f},{data['laps']},{data['raw_angle']},{data['raw_rpm'] if data['raw_rpm'] is not None else 0}"
-            print(output)
+            payload = (format_text(data) + "\n").encode("utf-8")
+            
+        write(payload)
+        pending += 1
+        if pending >= flush_every:
+            out.flush()
+            pending = 0
+    
+    # 連接中斷時結束監測，不再等待不會到達的樣本
+    def disconnect_callback(_):
+        logger.warning("編碼器連接中斷，停止監測")
+        stop_event.set()
     
     # 註冊資料更新事件監聽器
     controller.encoder_controller.register_event_listener("on_data_update", data_callback)
+    for event_name in ("on_disconnected", "on_connection_lost"):
+        controller.encoder_controller.register_event_listener(event_name, disconnect_callback)
     
     # 開始監測
-    result = controller.handle_command(f"start_monitor interval={interval} format={format_type}", "CLI")
+    result = controller.handle_command({"command": "start_monitor", "interval": interval, "format": format_type}, "CLI")
     if result.get("status") != "success":
         print(f"開始監測失敗: {result.get('message', '未知錯誤')}")
         return
     
     try:
-        # 持續運行直到按下 Ctrl+C
-        global running
-        while running:
-            time.sleep(0.1)
+        # 阻塞等待終止信號或連接中斷，資料由 data_callback 在到達時輸出，無需定時喚醒
+        stop_event.wait()
     except KeyboardInterrupt:
         print("\n停止監測")
     finally:
         # 停止監測
-        controller.handle_command("stop_monitor", "CLI")
+        controller.handle_command({"command": "stop_monitor"}, "CLI")
+        out.flush()
 
 def main():
     """主函數"""
-    global running, controller
+    global controller
     
     # 命令行參數解析
     parser = argparse.ArgumentParser(description="編碼器控制系統")
@@ -271,6 +374,10 @@ def main():
     
     args = parser.parse_args()
     
+    # 延遲導入套件模組，--help 與參數錯誤等路徑無需載入控制器及其依賴
+    from modbus_encoder.controllers.main_controller import MainController
+    from modbus_encoder.utils.config import ConfigManager
+    
     # 配置日誌
     setup_logging(args.debug)
     
@@ -278,14 +385,15 @@ def main():
     if args.port or args.baudrate or args.address or args.udp_host or args.udp_port:
         config = ConfigManager()
         
-        if args.port:
+        if args.port or args.baudrate:
             serial_config = config.get_serial_config()
-            serial_config['port'] = args.port
-            config.set_serial_config(serial_config)
             
-        if args.baudrate:
-            serial_config = config.get_serial_config()
-            serial_config['baudrate'] = args.baudrate
+            if args.port:
+                serial_config['port'] = args.port
+                
+            if args.baudrate:
+                serial_config['baudrate'] = args.baudrate
+                
             config.set_serial_config(serial_config)
             
         if args.address:
@@ -335,15 +443,17 @@ def main():
         # 處理子命令
         if args.subcommand:
             if hasattr(args, 'func'):
-                # 配置日誌
-                setup_logging(args.debug)
                 args.func(args)  # 關鍵：呼叫子命令對應的處理函數
                 return 0
         
-        # 選擇運行模式
+        # 選擇運行模式（僅非同步與服務模式需要 asyncio）
+        import asyncio
+        
         if getattr(args, 'async_mode', False):
             # 使用非同步模式
             if sys.platform == 'win32':
+                if sys.version_info >= (3, 12):
+                    return asyncio.run(async_mode(), loop_factory=asyncio.SelectorEventLoop)
                 asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
             return asyncio.run(async_mode())
         elif args.interactive:
@@ -351,11 +461,7 @@ def main():
             interactive_mode()
         else:
             # 服務模式
-            print("編碼器控制系統已啟動，按Ctrl+C停止...")
-            
-            # 主循環
-            while running:
-                time.sleep(1)
+            asyncio.run(service_mode())
                 
     except Exception as e:
         logging.exception(f"系統運行出錯: {e}")
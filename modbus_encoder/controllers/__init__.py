@@ -4,12 +4,13 @@
 匯出所有控制器類，方便其他模組導入
 """
 
-from .encoder_controller import EncoderController
+from .encoder_controller import EncoderController, MonitorSample
 from .gpio_controller import GPIOController
 from .main_controller import MainController
 
 __all__ = [
     'EncoderController',
+    'MonitorSample',
     'GPIOController',
     'MainController'
 ]
\ No newline at end of file
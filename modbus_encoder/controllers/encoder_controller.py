@@ -8,104 +8,38 @@ import time
 import logging
 import threading
 import asyncio
+import collections
+import concurrent.futures
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, Union, Tuple, List, Callable, Awaitable
 
 from ..modbus.client import ModbusClient
 from ..modbus.registers import RegisterAddress
 from ..utils.monitoring import ConnectionMonitor
-from ..utils.error_handling import execute_with_retry, safe_call, DeviceError
+from ..utils.error_handling import execute_with_retry, safe_call, DeviceError, EncoderSystemError
+# 保留此導入以兼容從本模組導入 ResourceManager 的舊代碼
+from ..utils.resource_manager import ResourceManager  # noqa: F401
 
 # 配置日誌
 logger = logging.getLogger(__name__)
 
-class ResourceManager:
-    """資源管理器類，使用引用計數管理共享資源"""
-    
-    def __init__(self):
-        """初始化資源管理器"""
-        self.resources = {}
-        self.lock = threading.RLock()
-        
-    def acquire(self, resource_name: str, creator: Callable = None) -> Any:
-        """獲取資源，如果不存在則創建
-        
-        Args:
-            resource_name: 資源名稱
-            creator: 資源創建函數
-            
-        Returns:
-            資源對象
-        """
-        with self.lock:
-            if resource_name not in self.resources:
-                if creator is None:
-                    raise ValueError(f"資源 {resource_name} 不存在且未提供創建函數")
-                
-                # 創建資源
-                self.resources[resource_name] = {
-                    "object": creator(),
-                    "ref_count": 0,
-                    "create_time": time.time()
-                }
-                
-            # 增加引用計數
-            self.resources[resource_name]["ref_count"] += 1
-            self.resources[resource_name]["last_access"] = time.time()
-            
-            logger.debug(f"獲取資源 {resource_name}，引用計數: {self.resources[resource_name]['ref_count']}")
-            
-            return self.resources[resource_name]["object"]
-            
-    def release(self, resource_name: str, cleanup: Callable = None) -> bool:
-        """釋放資源
-        
-        Args:
-            resource_name: 資源名稱
-            cleanup: 資源清理函數
-            
-        Returns:
-            是否成功釋放
-        """
-        with self.lock:
-            if resource_name not in self.resources:
-                logger.warning(f"嘗試釋放不存在的資源: {resource_name}")
-                return False
-                
-            # 減少引用計數
-            self.resources[resource_name]["ref_count"] -= 1
-            ref_count = self.resources[resource_name]["ref_count"]
-            
-            logger.debug(f"釋放資源 {resource_name}，剩餘引用計數: {ref_count}")
-            
-            # 如果引用計數為0，則清理資源
-            if ref_count <= 0:
-                if cleanup:
-                    try:
-                        cleanup(self.resources[resource_name]["object"])
-                    except Exception as e:
-                        logger.error(f"清理資源 {resource_name} 時出錯: {e}")
-                
-                # 移除資源
-                del self.resources[resource_name]
-                logger.info(f"資源 {resource_name} 已清理並移除")
-                
-            return True
+
+@dataclass(slots=True)
+class MonitorSample:
+    """監測數據樣本，由監測循環每次成功讀取後產生"""
+    address: int              # 編碼器地址
+    timestamp: float          # 時間戳
+    direction: int            # 方向
+    angle: float              # 角度 (0-360度)
+    rpm: Optional[float]      # 轉速 (RPM)
+    laps: int                 # 圈數
+    raw_angle: int            # 原始角度值
+    raw_rpm: Optional[int]    # 原始速度值
     
-    def get_stats(self) -> Dict[str, Any]:
-        """獲取資源統計信息
+    def to_dict(self) -> Dict[str, Any]:
+        """轉換為字典，僅在需要序列化時調用"""
+        return {name: getattr(self, name) for name in self.__slots__}
         
-        Returns:
-            資源統計信息字典
-        """
-        with self.lock:
-            stats = {}
-            for name, info in self.resources.items():
-                stats[name] = {
-                    "ref_count": info["ref_count"],
-                    "age": time.time() - info["create_time"],
-                    "last_access": time.time() - info.get("last_access", info["create_time"])
-                }
-            return stats
 
 class EncoderController:
     """編碼器控制器類
@@ -118,23 +52,36 @@ class EncoderController:
         """初始化編碼器控制器"""
         self.modbus_client = None
         self.connected = False
-        self.event_listeners = {}
+        # 每個事件對應一個不可變的監聽器元組，註冊時整體替換，觸發時無需加鎖
+        self.event_listeners: Dict[str, Tuple[Callable, ...]] = {}
         self.monitoring_thread = None
+        self.sample_dispatch_thread = None
         self.stop_monitoring_event = threading.Event()
         self.connection_monitor = None
         
         # 圈數計算相關
         self.last_position = None
         self.current_lap_count = 0
-        self.position_threshold = None  # 將在連接後根據編碼器分辨率設置
+        self.position_threshold = 2048  # 默認值，連接後根據編碼器分辨率更新
+        self._deg_per_count = 360.0 / 4096  # 每個計數對應的角度，連接後根據分辨率更新
+        self._last_speed = None  # 監測循環最近一次讀到的速度
         
-        # 線程安全鎖
-        self.lock = threading.RLock()
+        # 線程安全鎖（非重入），持鎖期間只調用不加鎖的內部方法
+        self.lock = threading.Lock()
         
         # 監控異常計數
         self.consecutive_errors = 0
         self.max_consecutive_errors = 5
         
+        # 設備是否支持一次讀取位置與速度的連續寄存器；
+        # 連續讀取失敗而逐個讀取成功達到次數上限才視為不支持，單次通訊錯誤不會停用連續讀取
+        self._block_read_supported = True
+        self._block_read_failures = 0
+        self.max_block_read_failures = 3
+        
+        # 非同步讀取共用的單一工作線程，串口本身只能串行存取
+        self._io_executor = None
+        
     def connect(self, port: str = "/dev/ttyUSB0", baudrate: int = 9600, address: int = 1, 
                 enable_monitor: bool = True) -> bool:
         """連接到編碼器設備
@@ -150,72 +97,42 @@ class EncoderController:
         """
         with self.lock:
             try:
-                # 創建Modbus客戶端
-                self.modbus_client = ModbusClient(
-                    port=port,
-                    baudrate=baudrate,
-                    slave_address=address,
-                    debug_mode=False
-                )
+                client = self._ensure_client(port, baudrate, address)
                 
                 # 連接設備
-                self.connected = self.modbus_client.connect()
+                connected = self.connected = client.connect()
                 
-                if self.connected:
+                if connected:
                     # 連接後重置圈數計數器
                     self.current_lap_count = 0
                     self.last_position = None
                     self.consecutive_errors = 0
                     
-                    # 設置閾值為編碼器分辨率的一半
-                    self.position_threshold = self.modbus_client.encoder_resolution / 2
+                    # 新連接的設備重新嘗試連續讀取
+                    self._block_read_supported = True
+                    self._block_read_failures = 0
+                    
+                    # 根據編碼器分辨率設置圈數閾值與角度換算係數
+                    self._update_resolution_constants()
                     
                     # 啟動連接監視器
                     if enable_monitor:
                         self._start_connection_monitor()
                         
                     logger.info(f"已成功連接到編碼器設備: 端口={port}, 波特率={baudrate}, 地址={address}")
-                    self._trigger_event("on_connected", None)
+                    event = ("on_connected", None)
                 else:
                     logger.error("無法連接到編碼器設備")
-                    self._trigger_event("on_connection_failed", "連接失敗")
+                    event = ("on_connection_failed", "連接失敗")
                     
-                return self.connected
-                
             except Exception as e:
                 logger.exception(f"連接編碼器設備時出錯: {e}")
-                self._trigger_event("on_connection_failed", str(e))
-                return False
-            
-    def disconnect(self) -> None:
-        """斷開與編碼器設備的連接並清理資源"""
-        with self.lock:
-            # 首先停止所有相關的活動
-            self._stop_connection_monitor()
-            self.stop_monitoring()
-            
-            # 等待監測線程終止
-            if self.monitoring_thread and self.monitoring_thread.is_alive():
-                logger.debug("等待監測線程終止...")
-                self.stop_monitoring_event.set()  # 確保停止事件已設置
-                try:
-                    self.monitoring_thread.join(timeout=2.0)
-                    if self.monitoring_thread.is_alive():
-                        logger.warning("監測線程無法在 2 秒內終止")
-                except Exception as e:
-                    logger.error(f"等待監測線程終止時出錯: {e}")
-            
-            # 關閉客戶端連接
-            if self.modbus_client:
-                try:
-                    self.modbus_client.close()
-                    logger.info("已關閉 Modbus 客戶端")
-                except Exception as e:
-                    logger.error(f"關閉 Modbus 客戶端出錯: {e}")
-            
-            self.connected = False
-            logger.info("已斷開與編碼器設備的連接")
-            self._trigger_event("on_disconnected", None)
+                connected = False
+                event = ("on_connection_failed", str(e))
+                
+        # 在鎖外觸發事件，監聽器中可再次調用本控制器的方法
+        self._trigger_event(*event)
+        return connected
             
     def read_position(self) -> Tuple[bool, Union[int, str]]:
         """讀取編碼器位置
@@ -239,12 +156,16 @@ class EncoderController:
                 self.consecutive_errors = 0
                 
                 # 更新圈數計算
-                self._update_lap_count(position)
-                return True, position
+                _, lap_event = self._update_lap_count(position)
             except Exception as e:
                 logger.error(f"讀取位置出錯: {e}")
                 self.consecutive_errors += 1
                 return False, str(e)
+                
+        # 在鎖外觸發圈數變化事件
+        if lap_event:
+            self._trigger_event("on_lap_change", lap_event)
+        return True, position
             
     def read_position_async(self, callback: Callable[[bool, Union[int, str]], None]) -> None:
         """非同步讀取編碼器位置
@@ -256,16 +177,11 @@ class EncoderController:
             callback(False, "編碼器未連接")
             return
             
-        def _read_task():
-            result = self.read_position()
-            callback(*result)
-            
-        thread = threading.Thread(target=_read_task)
-        thread.daemon = True
-        thread.start()
+        future = self._get_io_executor().submit(self.read_position)
+        future.add_done_callback(lambda f: callback(*f.result()))
         
     async def read_position_coroutine(self) -> Tuple[bool, Union[int, str]]:
-        """協程方式非同步讀取編碼器位置
+        """協程方式非同步讀取編碼器位置，須在運行中的事件循環內調用
         
         Returns:
             (成功狀態, 位置值或錯誤信息)
@@ -274,9 +190,30 @@ class EncoderController:
             return False, "編碼器未連接"
             
         # 在執行器中運行阻塞操作
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.read_position)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_executor(), self.read_position)
     
+    def _get_io_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """取得非同步讀取使用的執行器，首次使用或斷開連接後重新創建"""
+        executor = self._io_executor
+        if executor is None:
+            with self.lock:
+                if self._io_executor is None:
+                    self._io_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1,
+                        thread_name_prefix="EncoderIO"
+                    )
+                executor = self._io_executor
+        return executor
+        
+    def _shutdown_io_executor(self) -> None:
+        """關閉非同步讀取執行器"""
+        executor = self._io_executor
+        self._io_executor = None
+        if executor is not None:
+            # 不等待已排隊的讀取，它們可能正在等待本控制器的鎖
+            executor.shutdown(wait=False)
+            
     def read_multi_position(self) -> Tuple[bool, Union[int, str]]:
         """讀取編碼器多圈位置
         
@@ -311,13 +248,8 @@ class EncoderController:
             callback(False, "編碼器未連接")
             return
             
-        def _read_task():
-            result = self.read_multi_position()
-            callback(*result)
-            
-        thread = threading.Thread(target=_read_task)
-        thread.daemon = True
-        thread.start()
+        future = self._get_io_executor().submit(self.read_multi_position)
+        future.add_done_callback(lambda f: callback(*f.result()))
             
     def read_speed(self) -> Tuple[bool, Union[float, str]]:
         """讀取編碼器角速度
@@ -359,75 +291,103 @@ class EncoderController:
                 # 設置硬體零點
                 result = self.modbus_client.set_encoder_zero()
                 
-                if result:
-                    # 重置軟體圈數計數器
-                    self.current_lap_count = 0
-                    self.last_position = 0  # 初始化為零點位置
-                    
-                    # 觸發零點重置事件
-                    self._trigger_event("on_zero_set", {
-                        "timestamp": time.time(),
-                        "position": 0,
-                        "laps": 0
-                    })
-                    
-                    logger.info("編碼器零點設置成功，圈數計數器已重置")
-                    return True, None
-                else:
+                if not result:
                     return False, "編碼器零點設置失敗"
                     
+                # 重置軟體圈數計數器
+                self.current_lap_count = 0
+                self.last_position = 0  # 初始化為零點位置
+                
             except Exception as e:
                 logger.error(f"設置零點出錯: {e}")
                 return False, str(e)
+                
+        # 在鎖外觸發零點重置事件
+        self._trigger_event("on_zero_set", {
+            "timestamp": time.time(),
+            "position": 0,
+            "laps": 0
+        })
+        
+        logger.info("編碼器零點設置成功，圈數計數器已重置")
+        return True, None
             
-    def _update_lap_count(self, current_position: int) -> int:
+    def _update_lap_count(self, current_position: int) -> Tuple[int, Optional[Dict[str, Any]]]:
         """更新圈數計算
         
-        基於當前位置與上一次位置的變化計算圈數
+        基於當前位置與上一次位置的變化計算圈數；
+        圈數變化事件由調用者在釋放鎖之後觸發
         
         Args:
             current_position: 當前編碼器位置
             
         Returns:
-            當前圈數
+            (當前圈數, on_lap_change 事件數據，圈數未變化時為None)
         """
         # 此方法已在調用處加鎖，不需要重複鎖定
+        last_position = self.last_position
+        self.last_position = current_position
         
-        # 如果閾值未設置，使用默認值
-        if self.position_threshold is None:
-            self.position_threshold = 2048  # 默認值，應根據編碼器分辨率調整
-            
         # 如果這是第一次讀取位置，僅初始化參考值
-        if self.last_position is None:
-            self.last_position = current_position
-            return self.current_lap_count
+        if last_position is None:
+            return self.current_lap_count, None
             
-        # 計算位置差
-        pos_diff = current_position - self.last_position
-        
-        # 檢測跨越零點
-        if abs(pos_diff) > self.position_threshold:
-            # 從高位到低位 (順時針通過零點)
-            if pos_diff < 0:
-                self.current_lap_count += 1
-                self._trigger_event("on_lap_change", {
-                    "direction": "clockwise",
-                    "laps": self.current_lap_count,
-                    "position": current_position
-                })
-            # 從低位到高位 (逆時針通過零點)
-            else:
-                self.current_lap_count -= 1
-                self._trigger_event("on_lap_change", {
-                    "direction": "counterclockwise",
-                    "laps": self.current_lap_count,
-                    "position": current_position
-                })
-                
-        # 更新參考位置
-        self.last_position = current_position
+        # 計算位置差，未跨越零點是最常見的情況，直接返回
+        pos_diff = current_position - last_position
+        threshold = self.position_threshold
+        if -threshold <= pos_diff <= threshold:
+            return self.current_lap_count, None
+            
+        # 從高位到低位 (順時針通過零點)
+        if pos_diff < 0:
+            self.current_lap_count += 1
+            direction = "clockwise"
+        # 從低位到高位 (逆時針通過零點)
+        else:
+            self.current_lap_count -= 1
+            direction = "counterclockwise"
+            
+        return self.current_lap_count, {
+            "direction": direction,
+            "laps": self.current_lap_count,
+            "position": current_position
+        }
         
-        return self.current_lap_count
+    def _ensure_client(self, port: str, baudrate: int, address: int) -> ModbusClient:
+        """取得用於連接的Modbus客戶端（調用者須持有 self.lock）
+        
+        沿用參數相同的現有客戶端，只重新打開串口；否則關閉舊客戶端並創建新的
+        
+        Args:
+            port: 串口設備路徑
+            baudrate: 波特率
+            address: 編碼器地址
+            
+        Returns:
+            Modbus客戶端
+        """
+        client = self.modbus_client
+        if client is None or not client.can_reuse(port, baudrate, address):
+            if client is not None:
+                safe_call(client.close)
+            client = self.modbus_client = ModbusClient(
+                port=port,
+                baudrate=baudrate,
+                slave_address=address,
+                debug_mode=False
+            )
+        return client
+        
+    def _update_resolution_constants(self) -> None:
+        """根據編碼器分辨率更新圈數閾值與角度換算係數
+        
+        分辨率只在連接或重新配置時改變，預先計算可避免監測循環中的除法
+        """
+        resolution = self.modbus_client.encoder_resolution
+        
+        # 設置閾值為編碼器分辨率的一半
+        self.position_threshold = resolution / 2
+        self._deg_per_count = 360.0 / resolution
         
     def get_lap_count(self) -> int:
         """獲取當前圈數
@@ -435,8 +395,8 @@ class EncoderController:
         Returns:
             當前圈數
         """
-        with self.lock:
-            return self.current_lap_count
+        # 單一整數屬性的讀取本身是原子的，無需加鎖
+        return self.current_lap_count
         
         
     def get_direction(self) -> int:
@@ -448,22 +408,39 @@ class EncoderController:
         if not self.connected:
             return 0  # 未連接時默認為停止
             
+        # 監測運行中時直接使用最近一次讀到的速度，省去一次 Modbus 往返
+        speed = self._last_speed
+        if speed is not None and self.monitoring_thread and self.monitoring_thread.is_alive():
+            return self._direction_from_speed(speed)
+            
         try:
             success, speed = self.read_speed()
             if success and speed is not None:
-                # 定義停止的閾值（例如 1 RPM）
-                stop_threshold = 1.0
-                
-                if abs(speed) < stop_threshold:
-                    return 0  # 停止
-                elif speed > 0:
-                    return 1  # 正向旋轉 (順時針)
-                else:
-                    return -1  # 反向旋轉 (逆時針)
+                return self._direction_from_speed(speed)
                     
             return 0  # 讀取失敗時默認為停止
         except Exception:
             return 0  # 發生錯誤時默認為停止
+            
+    @staticmethod
+    def _direction_from_speed(speed: float) -> int:
+        """根據角速度判斷旋轉方向
+        
+        Args:
+            speed: 角速度(轉/分)
+            
+        Returns:
+            1: 正向旋轉 (順時針), 0: 停止, -1: 反向旋轉 (逆時針)
+        """
+        # 定義停止的閾值（例如 1 RPM）
+        stop_threshold = 1.0
+        
+        if abs(speed) < stop_threshold:
+            return 0  # 停止
+        elif speed > 0:
+            return 1  # 正向旋轉 (順時針)
+        else:
+            return -1  # 反向旋轉 (逆時針)
 
 
     def start_monitoring(self, interval: float = 0.5) -> Tuple[bool, Union[Dict[str, Any], str]]:
@@ -487,136 +464,206 @@ class EncoderController:
             # 重置停止事件
             self.stop_monitoring_event.clear()
             
+            # 監測樣本交由分發線程處理，慢速監聽器不會拖慢 Modbus 讀取
+            # 佇列有上限，積壓時自動丟棄最舊的樣本；None 表示監測已結束
+            sample_queue = collections.deque(maxlen=256)
+            sample_event = threading.Event()
+            
+            def dispatch_task():
+                popleft = sample_queue.popleft
+                try:
+                    while True:
+                        sample_event.wait()
+                        sample_event.clear()
+                        while sample_queue:
+                            sample = popleft()
+                            if sample is None:
+                                return
+                            self._trigger_event("on_data_update", sample)
+                finally:
+                    self._trigger_event("on_monitoring_stopped", {"timestamp": time.time()})
+                    
             # 創建監測任務
             def monitoring_task():
                 logger.debug("編碼器監測線程已啟動")
                 consecutive_errors = 0
                 error_threshold = self.max_consecutive_errors
-                last_successful_read = time.time()
+                last_successful_read = time.monotonic()
                 max_failure_time = 10.0  # 10秒無成功讀取視為失敗
+                # 持續故障時只回報首次錯誤，之後每隔一段時間回報一次，避免日誌與事件洪流
+                error_report_interval = 5.0
+                last_error_report = None
+                
+                # 預先綁定循環中反覆使用的屬性與方法
+                lock = self.lock
+                stop_is_set = self.stop_monitoring_event.is_set
+                stop_wait = self.stop_monitoring_event.wait
+                read_block = self._read_position_and_speed_block
+                update_lap = self._update_lap_count
+                direction_from_speed = self._direction_from_speed
+                trigger = self._trigger_event
+                push_sample = sample_queue.append
+                notify_sample = sample_event.set
+                event_listeners = self.event_listeners
+                monotonic = time.monotonic
+                wall_time = time.time
+                
+                # 以絕對截止時間排程，讀取耗時不會累積成採樣週期漂移
+                deadline = monotonic()
                 
                 try:
-                    while not self.stop_monitoring_event.is_set():
+                    while True:
+                        # 等待到下一個截止時間 (使用事件等待，可以更快回應停止請求)
+                        now = monotonic()
+                        remaining = deadline - now
+                        if remaining > 0:
+                            if stop_wait(remaining):
+                                break
+                        else:
+                            if stop_is_set():
+                                break
+                            # 落後超過一個週期時回報，供診斷採樣節奏
+                            if -remaining > interval:
+                                logger.debug("監測循環落後排程 %.3f 秒", -remaining)
+                                trigger("on_monitor_drift", {
+                                    "timestamp": wall_time(),
+                                    "lag": -remaining,
+                                    "interval": interval
+                                })
+                            # 已落後於排程時重新對齊，避免連續補讀
+                            deadline = now
+                        deadline += interval
+                        
                         try:
-                            # 讀取編碼器資料
-                            with self.lock:
-                                # 檢查連接狀態
-                                if not self.connected:
-                                    logger.error("監測過程中檢測到編碼器已斷開連接")
-                                    self._trigger_event("on_monitor_error", {
-                                        "timestamp": time.time(),
-                                        "message": "編碼器已斷開連接"
-                                    })
-                                    break
+                            # 只在串口讀取與圈數狀態更新期間持有鎖，
+                            # 錯誤處理、計算與事件觸發都在鎖外進行，外部 API 調用不必等待整個週期
+                            lap_event = None
+                            with lock:
+                                connected = self.connected
+                                if connected:
+                                    # 讀取位置與速度
+                                    position, raw_speed_value, speed = read_block()
                                     
-                                # 讀取位置
-                                position = self.modbus_client.read_encoder_position()
-                                if position is None:
-                                    consecutive_errors += 1
-                                    
-                                    # 檢查連續錯誤是否超過閾值
-                                    if consecutive_errors > error_threshold:
-                                        logger.error(f"連續讀取失敗 {consecutive_errors} 次，停止監測")
-                                        # 發送錯誤事件
-                                        self._trigger_event("on_monitor_error", {
-                                            "timestamp": time.time(),
-                                            "message": f"連續讀取失敗 {consecutive_errors} 次"
-                                        })
-                                        break
+                                    # 更新圈數
+                                    if position is not None:
+                                        lap_count, lap_event = update_lap(position)
                                         
-                                    # 檢查無成功讀取的時間是否超過閾值
-                                    if time.time() - last_successful_read > max_failure_time:
-                                        logger.error(f"{max_failure_time} 秒內無成功讀取，停止監測")
-                                        self._trigger_event("on_monitor_error", {
-                                            "timestamp": time.time(),
-                                            "message": f"{max_failure_time} 秒內無成功讀取"
-                                        })
-                                        break
-                                    
-                                    # 發送錯誤事件
-                                    self._trigger_event("on_monitor_error", {
-                                        "timestamp": time.time(),
-                                        "message": "讀取位置失敗"
-                                    })
-                                    self.stop_monitoring_event.wait(interval)
-                                    continue
-                                    
-                                # 更新圈數
-                                lap_count = self._update_lap_count(position)
+                            if lap_event:
+                                trigger("on_lap_change", lap_event)
                                 
-                                # 讀取速度
-                                try:
-                                    # 先取得原始速度值
-                                    raw_speed_value = self.modbus_client.read_register(RegisterAddress.ENCODER_ANGULAR_SPEED)
-                                    # 轉換為帶符號數
-                                    if raw_speed_value is not None and raw_speed_value > 32767:
-                                        raw_speed_value = raw_speed_value - 65536
-                                    # 取得計算後的速度值
-                                    speed = self.modbus_client.read_encoder_speed()
-                                except Exception as e:
-                                    logger.error(f"讀取速度出錯: {e}")
-                                    raw_speed_value = None
-                                    speed = None
-                                    
-                                # 重置連續錯誤計數和上次成功讀取時間
-                                consecutive_errors = 0
-                                last_successful_read = time.time()
+                            # 檢查連接狀態
+                            if not connected:
+                                logger.error("監測過程中檢測到編碼器已斷開連接")
+                                trigger("on_monitor_error", {
+                                    "timestamp": wall_time(),
+                                    "message": "編碼器已斷開連接"
+                                })
+                                break
                                 
-                                # 獲取方向
-                                direction = self.get_direction()
+                            # 單調時鐘已在循環開始時讀取，牆上時間只用於事件時間戳
+                            timestamp = wall_time()
+                            
+                            if position is None:
+                                consecutive_errors += 1
                                 
-                                # 獲取分辨率
-                                resolution = self.modbus_client.encoder_resolution
+                                # 檢查連續錯誤是否超過閾值
+                                if consecutive_errors > error_threshold:
+                                    logger.error(f"連續讀取失敗 {consecutive_errors} 次，停止監測")
+                                    # 發送錯誤事件
+                                    trigger("on_monitor_error", {
+                                        "timestamp": timestamp,
+                                        "message": f"連續讀取失敗 {consecutive_errors} 次"
+                                    })
+                                    break
+                                    
+                                # 檢查無成功讀取的時間是否超過閾值
+                                if now - last_successful_read > max_failure_time:
+                                    logger.error(f"{max_failure_time} 秒內無成功讀取，停止監測")
+                                    trigger("on_monitor_error", {
+                                        "timestamp": timestamp,
+                                        "message": f"{max_failure_time} 秒內無成功讀取"
+                                    })
+                                    break
                                 
-                                # 計算角度 (參考 6.4.1)
-                                angle = position * 360.0 / resolution
+                                # 發送錯誤事件 (限流)
+                                if consecutive_errors == 1 or now - last_error_report >= error_report_interval:
+                                    last_error_report = now
+                                    logger.warning("讀取位置失敗，連續失敗 %d 次", consecutive_errors)
+                                    trigger("on_monitor_error", {
+                                        "timestamp": timestamp,
+                                        "message": "讀取位置失敗",
+                                        "consecutive_errors": consecutive_errors
+                                    })
+                                continue
                                 
-                                # 角速度已在 ModbusClient.read_encoder_speed 中計算 (參考 6.4.3)
+                            # 重置連續錯誤計數和上次成功讀取時間
+                            consecutive_errors = 0
+                            last_successful_read = now
+                            
+                            # 獲取方向（使用本次讀到的速度，不再另行讀取）
+                            self._last_speed = speed
+                            direction = 0 if speed is None else direction_from_speed(speed)
+                            
+                            # 計算角度 (參考 6.4.1)
+                            angle = position * self._deg_per_count
                             
-                            # 生成資料包
-                            current_time = time.time()
-                            data_package = {
-                                "address": self.modbus_client.slave_address,
-                                "timestamp": current_time,
-                                "direction": direction,
-                                "angle": angle,  # 角度 (0-360度)
-                                "rpm": speed,    # 轉速 (RPM)
-                                "laps": lap_count,
-                                "raw_angle": position,      # 原始角度值
-                                "raw_rpm": raw_speed_value  # 原始速度值
-                            }
+                            # 角速度已在 ModbusClient.read_encoder_speed 中計算 (參考 6.4.3)
                             
-                            # 觸發資料更新事件
-                            self._trigger_event("on_data_update", data_package)
+                            # 沒有資料監聽器時不必生成資料樣本
+                            if not event_listeners.get("on_data_update"):
+                                continue
+                                
+                            # 生成資料樣本
+                            sample = MonitorSample(
+                                self.modbus_client.slave_address,
+                                timestamp,
+                                direction,
+                                angle,
+                                speed,
+                                lap_count,
+                                position,
+                                raw_speed_value
+                            )
                             
-                            # 等待下一次監測 (使用事件等待，可以更快回應停止請求)
-                            self.stop_monitoring_event.wait(interval)
+                            # 交給分發線程觸發資料更新事件
+                            push_sample(sample)
+                            notify_sample()
                             
                         except Exception as e:
-                            logger.error(f"監測任務出錯: {e}")
                             consecutive_errors += 1
                             
                             if consecutive_errors > error_threshold:
-                                logger.error(f"連續出錯 {consecutive_errors} 次，停止監測")
-                                self._trigger_event("on_monitor_error", {
-                                    "timestamp": time.time(),
+                                logger.error(f"連續出錯 {consecutive_errors} 次，停止監測: {e}")
+                                trigger("on_monitor_error", {
+                                    "timestamp": wall_time(),
                                     "message": f"連續出錯 {consecutive_errors} 次: {e}"
                                 })
                                 break
                                 
-                            # 發送錯誤事件
-                            self._trigger_event("on_monitor_error", {
-                                "timestamp": time.time(),
-                                "message": f"監測出錯: {e}"
-                            })
-                                
-                            # 等待下一次嘗試
-                            self.stop_monitoring_event.wait(interval)
+                            # 記錄並發送錯誤事件 (限流)
+                            if consecutive_errors == 1 or now - last_error_report >= error_report_interval:
+                                last_error_report = now
+                                logger.error(f"監測任務出錯: {e}")
+                                trigger("on_monitor_error", {
+                                    "timestamp": wall_time(),
+                                    "message": f"監測出錯: {e}",
+                                    "consecutive_errors": consecutive_errors
+                                })
                 finally:
+                    self._last_speed = None
                     logger.info("編碼器監測已停止")
-                    self._trigger_event("on_monitoring_stopped", {"timestamp": time.time()})
+                    # 通知分發線程處理完剩餘樣本後結束
+                    push_sample(None)
+                    notify_sample()
                     
-            # 創建並啟動監測線程
+            # 創建並啟動分發線程與監測線程
+            self.sample_dispatch_thread = threading.Thread(
+                target=dispatch_task,
+                name="EncoderSampleDispatchThread"
+            )
+            self.sample_dispatch_thread.daemon = True
+            self.sample_dispatch_thread.start()
+            
             self.monitoring_thread = threading.Thread(
                 target=monitoring_task,
                 name="EncoderMonitorThread"
@@ -625,15 +672,54 @@ class EncoderController:
             self.monitoring_thread.start()
             
             logger.info(f"編碼器監測已啟動，間隔: {interval}秒")
-            self._trigger_event("on_monitoring_started", {"interval": interval, "timestamp": time.time()})
             
-            return True, {
-                "status": "started",
-                "interval": interval,
-                "start_time": time.time()
-            }
+        # 在鎖外觸發監測啟動事件
+        self._trigger_event("on_monitoring_started", {"interval": interval, "timestamp": time.time()})
+        
+        return True, {
+            "status": "started",
+            "interval": interval,
+            "start_time": time.time()
+        }
             
             
+    def _read_position_and_speed_block(self) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+        """讀取監測所需的位置與速度
+        
+        優先以單次請求讀取連續寄存器；設備不支持時改為逐個寄存器讀取
+        
+        Returns:
+            (單圈值, 帶符號的角速度值, 角速度(轉/分))，讀取失敗的項目為None
+        """
+        if self._block_read_supported:
+            block = self.modbus_client.read_encoder_block()
+            if block is not None:
+                self._block_read_failures = 0
+                return block
+                
+        # 逐個寄存器讀取
+        position = self.modbus_client.read_encoder_position()
+        if position is None:
+            return None, None, None
+            
+        if self._block_read_supported:
+            # 單獨讀取成功而連續讀取持續失敗，說明設備不支持連續讀取
+            self._block_read_failures += 1
+            if self._block_read_failures >= self.max_block_read_failures:
+                logger.warning("設備不支持連續讀取位置與速度，改為逐個寄存器讀取")
+                self._block_read_supported = False
+            
+        try:
+            # 取得帶符號的原始速度值
+            raw_speed_value = self.modbus_client.read_register(RegisterAddress.ENCODER_ANGULAR_SPEED, signed=True)
+            if raw_speed_value is None:
+                return position, None, None
+                
+            return position, raw_speed_value, self.modbus_client.speed_value_to_rpm(raw_speed_value)
+        except Exception as e:
+            logger.error(f"讀取速度出錯: {e}")
+            return position, None, None
+            
     def stop_monitoring(self) -> Tuple[bool, Optional[str]]:
         """增強的停止監測方法，確保監測線程完全終止
         
@@ -641,7 +727,8 @@ class EncoderController:
             (成功狀態, 錯誤信息)
         """
         with self.lock:
-            if not self.monitoring_thread or not self.monitoring_thread.is_alive():
+            monitoring_thread = self.monitoring_thread
+            if not monitoring_thread or not monitoring_thread.is_alive():
                 logger.debug("沒有運行中的監測任務，無需停止")
                 return False, "沒有運行中的監測任務"
                 
@@ -650,23 +737,32 @@ class EncoderController:
             # 通知監測線程停止
             self.stop_monitoring_event.set()
             
-            # 等待監測線程終止
-            try:
-                # 使用超時機制
-                self.monitoring_thread.join(timeout=3.0)
-                
-                if self.monitoring_thread.is_alive():
-                    logger.warning("監測線程在3秒內未能正常終止")
-                    return False, "監測線程未能正常終止"
-            except Exception as e:
-                logger.error(f"等待監測線程終止時出錯: {e}")
-                return False, f"等待監測線程終止時出錯: {e}"
+        # 在鎖外等待監測線程終止，監測線程每次讀取都需要取得鎖
+        try:
+            # 使用超時機制
+            monitoring_thread.join(timeout=3.0)
             
-            # 重置監測線程
-            self.monitoring_thread = None
-            logger.info("編碼器監測已停止")
+            if monitoring_thread.is_alive():
+                logger.warning("監測線程在3秒內未能正常終止")
+                return False, "監測線程未能正常終止"
+        except Exception as e:
+            logger.error(f"等待監測線程終止時出錯: {e}")
+            return False, f"等待監測線程終止時出錯: {e}"
             
-            return True, None
+        # 等待分發線程送出剩餘樣本；若由監聽器自身調用則不可等待自己
+        dispatch_thread = self.sample_dispatch_thread
+        if dispatch_thread and dispatch_thread is not threading.current_thread():
+            dispatch_thread.join(timeout=1.0)
+            if dispatch_thread.is_alive():
+                logger.warning("樣本分發線程在1秒內未能正常終止")
+        
+        # 重置監測線程
+        with self.lock:
+            if self.monitoring_thread is monitoring_thread:
+                self.monitoring_thread = None
+        logger.info("編碼器監測已停止")
+        
+        return True, None
         
         
     def register_event_listener(self, event_name: str, callback: Callable) -> None:
@@ -677,11 +773,8 @@ class EncoderController:
             callback: 回調函數
         """
         with self.lock:
-            if event_name not in self.event_listeners:
-                self.event_listeners[event_name] = []
-                
-            self.event_listeners[event_name].append(callback)
-            logger.debug(f"已註冊事件監聽器: {event_name}")
+            self.event_listeners[event_name] = self.event_listeners.get(event_name, ()) + (callback,)
+            logger.debug("已註冊事件監聽器: %s", event_name)
         
     def _trigger_event(self, event_name: str, data: Any) -> None:
         """觸發事件
@@ -690,12 +783,11 @@ class EncoderController:
             event_name: 事件名稱
             data: 事件數據
         """
-        # 複製一份監聽器列表，避免處理過程中列表變化
-        listeners = []
-        with self.lock:
-            if event_name in self.event_listeners:
-                listeners = self.event_listeners[event_name].copy()
-                
+        # 監聽器元組不會被原地修改，直接讀取即可，無需加鎖複製
+        listeners = self.event_listeners.get(event_name)
+        if not listeners:
+            return
+            
         for callback in listeners:
             try:
                 callback(data)
@@ -703,21 +795,25 @@ class EncoderController:
                 logger.error(f"執行事件回調出錯: {e}")
                 
     def _start_connection_monitor(self) -> None:
-        """啟動連接監視器"""
-        with self.lock:
-            if self.connection_monitor:
-                return
-                
-            self.connection_monitor = ConnectionMonitor(self.modbus_client)
-            self.connection_monitor.add_connection_listener(self._on_connection_change)
-            self.connection_monitor.start()
+        """啟動連接監視器（調用者須持有 self.lock）"""
+        if self.connection_monitor:
+            return
+            
+        self.connection_monitor = ConnectionMonitor(self.modbus_client)
+        self.connection_monitor.add_connection_listener(self._on_connection_change)
+        self.connection_monitor.start()
         
     def _stop_connection_monitor(self) -> None:
-        """停止連接監視器"""
+        """停止連接監視器（調用者不得持有 self.lock）
+        
+        停止時會等待監視線程結束，而該線程的回調需要取得鎖，因此只在鎖內取下監視器
+        """
         with self.lock:
-            if self.connection_monitor:
-                self.connection_monitor.stop()
-                self.connection_monitor = None
+            monitor = self.connection_monitor
+            self.connection_monitor = None
+            
+        if monitor:
+            monitor.stop()
             
     def _on_connection_change(self, connected: bool, error: Optional[str] = None) -> None:
         """連接狀態變化回調
@@ -727,15 +823,17 @@ class EncoderController:
             error: 錯誤信息
         """
         with self.lock:
-            if self.connected != connected:
-                self.connected = connected
-                
-                if connected:
-                    logger.info("編碼器連接已恢復")
-                    self._trigger_event("on_connection_restored", None)
-                else:
-                    logger.warning(f"編碼器連接已斷開: {error}")
-                    self._trigger_event("on_connection_lost", error)
+            if self.connected == connected:
+                return
+            self.connected = connected
+            
+        # 在鎖外觸發事件，監聽器中可再次調用本控制器的方法
+        if connected:
+            logger.info("編碼器連接已恢復")
+            self._trigger_event("on_connection_restored", None)
+        else:
+            logger.warning(f"編碼器連接已斷開: {error}")
+            self._trigger_event("on_connection_lost", error)
                 
     def get_status(self) -> Dict[str, Any]:
         """獲取編碼器狀態
@@ -743,35 +841,41 @@ class EncoderController:
         Returns:
             狀態字典
         """
-        with self.lock:
-            status = {
-                "connected": self.connected,
-                "lap_count": self.current_lap_count,
-                "error_count": self.consecutive_errors
-            }
+        # 計數器只在持有 self.lock 的 Modbus 讀寫路徑中修改；這裡僅作單次屬性讀取，
+        # 不必等待進行中的 Modbus 往返，狀態查詢因此不會被串口 I/O 阻塞
+        status = {
+            "connected": self.connected,
+            "lap_count": self.current_lap_count,
+            "error_count": self.consecutive_errors
+        }
+        
+        modbus_client = self.modbus_client
+        if modbus_client:
+            status.update({
+                "port": modbus_client.port,
+                "baudrate": modbus_client.baudrate,
+                "address": modbus_client.slave_address,
+                "resolution": modbus_client.encoder_resolution
+            })
             
-            if self.modbus_client:
-                status.update({
-                    "port": self.modbus_client.port,
-                    "baudrate": self.modbus_client.baudrate,
-                    "address": self.modbus_client.slave_address,
-                    "resolution": self.modbus_client.encoder_resolution
-                })
+            if modbus_client.debug_mode:
+                comm_stats = modbus_client.get_communication_stats()
+                status["communication_stats"] = comm_stats
                 
-                if self.modbus_client.debug_mode:
-                    comm_stats = self.modbus_client.get_communication_stats()
-                    status["communication_stats"] = comm_stats
-                    
-            if self.monitoring_thread and self.monitoring_thread.is_alive():
-                status["monitoring"] = "running"
-            else:
-                status["monitoring"] = "stopped"
-                
-            return status
+        monitoring_thread = self.monitoring_thread
+        if monitoring_thread and monitoring_thread.is_alive():
+            status["monitoring"] = "running"
+        else:
+            status["monitoring"] = "stopped"
             
+        return status
+        
     def execute_with_retry(self, func: Callable, *args, max_retries: int = 3, **kwargs) -> Any:
         """使用自動重試執行函數
         
+        只有拋出異常、返回 None 或返回首元素為 False 的 (bool, ...) 元組才視為失敗，
+        其他返回值（包括狀態字典）一律原樣返回；退避延遲由通用重試執行器計算
+        
         Args:
             func: 要執行的函數
             *args: 函數參數
@@ -779,42 +883,30 @@ class EncoderController:
             **kwargs: 關鍵字參數
             
         Returns:
-            函數執行結果
+            函數執行結果，僅因返回值失敗而重試耗盡時返回 (False, "操作重試失敗")
             
         Raises:
-            Exception: 重試失敗後的最後一個異常
+            Exception: 重試失敗後的最後一個原始異常
         """
-        retries = 0
-        last_error = None
-        
-        while retries <= max_retries:
-            try:
-                result = func(*args, **kwargs)
-                # 如果是元組形式的結果且第一個元素為布爾值（例如我們的標準返回格式）
-                if isinstance(result, tuple) and len(result) > 1 and isinstance(result[0], bool):
-                    if result[0]:  # 成功
-                        return result
-                else:
-                    # 對於其他類型的結果，如果非None就視為成功
-                    if result is not None:
-                        return result
-                
-                # 到這裡表示需要重試
-                retries += 1
-                if retries <= max_retries:
-                    logger.warning(f"操作失敗，將重試 ({retries}/{max_retries})")
-                    time.sleep(0.5 * retries)  # 逐漸增加重試間隔
-            except Exception as e:
-                last_error = e
-                retries += 1
-                if retries <= max_retries:
-                    logger.warning(f"操作出錯 ({retries}/{max_retries}): {e}")
-                    time.sleep(0.5 * retries)
-        
-        # 所有重試都失敗
-        if last_error:
-            raise last_error
-        return (False, "操作重試失敗")
+        def is_success(result: Any) -> bool:
+            if isinstance(result, tuple) and len(result) > 1 and isinstance(result[0], bool):
+                return result[0]
+            return result is not None
+            
+        try:
+            return execute_with_retry(
+                func, *args,
+                max_retries=max_retries,
+                retry_delay=0.5,
+                max_delay=2.0,
+                is_success=is_success,
+                **kwargs
+            )
+        except EncoderSystemError as e:
+            # 保持原有約定：拋出最後一個原始異常，僅返回值失敗時返回失敗元組
+            if e.__cause__ is not None:
+                raise e.__cause__
+            return (False, "操作重試失敗")
     
     def __enter__(self):
         """上下文管理器進入"""
@@ -826,8 +918,8 @@ class EncoderController:
         """上下文管理器退出"""
         self.disconnect()
         
-    async def read_position_and_speed_async(self) -> Tuple[Optional[int], Optional[float]]:
-        """同時讀取位置和速度（非同步版本）
+    def read_position_and_speed(self) -> Tuple[Optional[int], Optional[float]]:
+        """以單次 Modbus 請求同時讀取位置和速度
         
         Returns:
             (位置, 速度)，讀取失敗時對應值為None
@@ -836,23 +928,39 @@ class EncoderController:
             return None, None
             
         with self.lock:
-            # 創建兩個任務
-            loop = asyncio.get_event_loop()
-            position_future = loop.run_in_executor(None, self.read_position)
-            speed_future = loop.run_in_executor(None, self.read_speed)
-            
-            # 等待兩個任務完成
-            position_result, speed_result = await asyncio.gather(position_future, speed_future)
-            
-            # 解析結果
-            position_success, position = position_result if position_result else (False, None)
-            speed_success, speed = speed_result if speed_result else (False, None)
-            
-            # 更新圈數（如果讀取位置成功）
-            if position_success:
-                self._update_lap_count(position)
+            try:
+                position, _, speed = self._read_position_and_speed_block()
+                if position is None:
+                    self.consecutive_errors += 1
+                    return None, None
+                    
+                # 重置錯誤計數
+                self.consecutive_errors = 0
                 
-            return position if position_success else None, speed if speed_success else None
+                # 更新圈數計算
+                _, lap_event = self._update_lap_count(position)
+            except Exception as e:
+                logger.error(f"讀取位置和速度出錯: {e}")
+                self.consecutive_errors += 1
+                return None, None
+                
+        # 在鎖外觸發圈數變化事件
+        if lap_event:
+            self._trigger_event("on_lap_change", lap_event)
+        return position, speed
+                
+    async def read_position_and_speed_async(self) -> Tuple[Optional[int], Optional[float]]:
+        """同時讀取位置和速度（非同步版本），須在運行中的事件循環內調用
+        
+        Returns:
+            (位置, 速度)，讀取失敗時對應值為None
+        """
+        if not self.connected:
+            return None, None
+            
+        # 串口只能串行存取，以一次合併讀取取代兩個看似並行的請求
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_executor(), self.read_position_and_speed)
 
     def connect_with_retry(self, port: str = "/dev/ttyUSB0", baudrate: int = 9600, address: int = 1, 
                         enable_monitor: bool = True, max_retries: int = 3) -> bool:
@@ -871,20 +979,19 @@ class EncoderController:
         # 定義重試回調
         def on_retry(retry_count, exception):
             logger.warning(f"連接編碼器失敗 (嘗試 {retry_count}/{max_retries}): {exception}")
-            # 重置客戶端狀態
+            # 重置客戶端狀態，下次嘗試前的等待由重試執行器的退避延遲負責
             if hasattr(self, 'modbus_client') and self.modbus_client:
                 safe_call(self.modbus_client.close)
-                # 短暫延遲後重新創建客戶端
-                time.sleep(0.2)
         
-        # 使用重試執行器
+        # 使用重試執行器（指數退避加隨機抖動，單次等待上限 30 秒）
         try:
             return execute_with_retry(
                 self._connect_internal,
                 port, baudrate, address, enable_monitor,
                 max_retries=max_retries,
                 on_retry=on_retry,
-                retry_delay=1.0
+                retry_delay=1.0,
+                max_delay=30.0
             )
         except Exception as e:
             logger.error(f"連接編碼器最終失敗: {e}")
@@ -905,42 +1012,42 @@ class EncoderController:
         """
         with self.lock:
             try:
-                # 創建Modbus客戶端
-                self.modbus_client = ModbusClient(
-                    port=port,
-                    baudrate=baudrate,
-                    slave_address=address,
-                    debug_mode=False
-                )
+                client = self._ensure_client(port, baudrate, address)
                 
                 # 連接設備
-                self.connected = self.modbus_client.connect()
+                connected = self.connected = client.connect()
                 
-                if self.connected:
+                if connected:
                     # 連接後重置圈數計數器
                     self.current_lap_count = 0
                     self.last_position = None
                     self.consecutive_errors = 0
                     
-                    # 設置閾值為編碼器分辨率的一半
-                    self.position_threshold = self.modbus_client.encoder_resolution / 2
+                    # 新連接的設備重新嘗試連續讀取
+                    self._block_read_supported = True
+                    self._block_read_failures = 0
+                    
+                    # 根據編碼器分辨率設置圈數閾值與角度換算係數
+                    self._update_resolution_constants()
                     
                     # 啟動連接監視器
                     if enable_monitor:
                         self._start_connection_monitor()
                         
                     logger.info(f"已成功連接到編碼器設備: 端口={port}, 波特率={baudrate}, 地址={address}")
-                    self._trigger_event("on_connected", None)
+                    event = ("on_connected", None)
                 else:
                     logger.error("無法連接到編碼器設備")
-                    self._trigger_event("on_connection_failed", "連接失敗")
+                    event = ("on_connection_failed", "連接失敗")
                     
-                return self.connected
-                
             except Exception as e:
                 logger.exception(f"連接編碼器設備時出錯: {e}")
-                self._trigger_event("on_connection_failed", str(e))
-                return False
+                connected = False
+                event = ("on_connection_failed", str(e))
+                
+        # 在鎖外觸發事件，監聽器中可再次調用本控制器的方法
+        self._trigger_event(*event)
+        return connected
 
     def disconnect(self) -> None:
         """增強的斷開連接方法，確保所有資源正確釋放
@@ -950,33 +1057,19 @@ class EncoderController:
         2. 使用超時機制確保線程終止
         3. 完全清理資源
         """
-        with self.lock:
-            # 首先停止所有相關的活動
-            self._stop_connection_monitor()
-            
-            # 停止監測並等待確認
-            monitoring_stopped = False
-            if hasattr(self, 'monitoring_thread') and self.monitoring_thread and self.monitoring_thread.is_alive():
-                logger.debug("正在停止監測線程...")
-                self.stop_monitoring()
-                try:
-                    # 等待監測線程終止的超時機制
-                    start_time = time.time()
-                    max_wait = 3.0  # 最多等待3秒
-                    
-                    while self.monitoring_thread.is_alive() and (time.time() - start_time) < max_wait:
-                        time.sleep(0.1)
-                        
-                    if not self.monitoring_thread.is_alive():
-                        monitoring_stopped = True
-                        logger.debug("監測線程已成功終止")
-                    else:
-                        logger.warning(f"監測線程在 {max_wait} 秒內未能終止")
-                except Exception as e:
-                    logger.error(f"等待監測線程終止時出錯: {e}")
-            else:
-                monitoring_stopped = True
+        # 先在鎖外停止監測並等待確認，監測線程每次讀取都需要取得鎖
+        monitoring_stopped = True
+        monitoring_thread = self.monitoring_thread
+        if monitoring_thread and monitoring_thread.is_alive():
+            logger.debug("正在停止監測線程...")
+            monitoring_stopped, _ = self.stop_monitoring()
+            if monitoring_stopped:
+                logger.debug("監測線程已成功終止")
                 
+        # 在鎖外停止連接監視器，它的線程可能正在等待鎖以回報連接狀態
+        self._stop_connection_monitor()
+        
+        with self.lock:
             # 關閉Modbus客戶端連接
             if self.modbus_client:
                 try:
@@ -985,15 +1078,18 @@ class EncoderController:
                     self.modbus_client = None
                 except Exception as e:
                     logger.error(f"關閉 Modbus 客戶端出錯: {e}")
+                    
+            # 關閉非同步讀取執行器
+            self._shutdown_io_executor()
             
             # 更新連接狀態
             self.connected = False
             
-            # 觸發斷開連接事件
-            self._trigger_event("on_disconnected", 
-                            {"status": "success",
-                            "monitoring_clean_stop": monitoring_stopped,
-                            "timestamp": time.time()}) 
+        # 觸發斷開連接事件
+        self._trigger_event("on_disconnected", 
+                        {"status": "success",
+                        "monitoring_clean_stop": monitoring_stopped,
+                        "timestamp": time.time()}) 
         
 class ThreadSafeEncoderController:
     """線程安全的編碼器控制器，提供自動資源管理和線程安全保證"""
@@ -1004,9 +1100,19 @@ class ThreadSafeEncoderController:
         Args:
             encoder_controller: 原始編碼器控制器
         """
+        # 已緩存包裝方法的名稱，更換控制器時據此清除
+        self._wrapped_names = set()
         self.encoder_controller = encoder_controller
         self.lock = threading.RLock()
         
+    def __setattr__(self, name, value):
+        """更換編碼器控制器時清除舊控制器方法的包裝緩存"""
+        if name == "encoder_controller":
+            for wrapped_name in self._wrapped_names:
+                self.__dict__.pop(wrapped_name, None)
+            self._wrapped_names.clear()
+        object.__setattr__(self, name, value)
+        
     def __enter__(self):
         """上下文管理器進入"""
         self.lock.acquire()
@@ -1029,10 +1135,16 @@ class ThreadSafeEncoderController:
         
         if callable(attr):
             # 如果是方法，返回線程安全的包裝
+            lock = self.lock
+            
             def thread_safe_method(*args, **kwargs):
-                with self.lock:
+                with lock:
                     return attr(*args, **kwargs)
+                    
+            # 緩存包裝後的方法，之後的存取直接命中實例字典，不再進入 __getattr__
+            self.__dict__[name] = thread_safe_method
+            self._wrapped_names.add(name)
             return thread_safe_method
         else:
-            # 如果是屬性，直接返回
-            return 
\ No newline at end of file
+            # 如果是屬性，直接返回（不緩存，屬性值可能隨時變化）
+            return attr 
@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, Union, Tuple, List, Callable
 
 from ..hardware.gpio import GPIOHardware
 from ..utils.monitoring import ConnectionMonitor
+from ..utils.scheduler import DeferredScheduler
 
 # 配置日誌
 logger = logging.getLogger(__name__)
@@ -28,7 +29,18 @@ class GPIOController:
         self.initialized = False
         self.event_listeners = {}
         self.pin_states = {}  # 記錄引腳狀態
-        self.lock = threading.RLock()  # 添加鎖
+        self._pin_to_index = {}  # GPIO引腳號到輸出索引的映射
+        # 鎖只保護硬體操作與狀態記錄，事件回調一律在鎖外觸發，因此不需要可重入鎖
+        self.lock = threading.Lock()
+        
+        # 脈衝結束由單一調度線程處理，每個引腳記錄最新脈衝序號以免舊脈衝提前結束新脈衝
+        self._pulse_scheduler = DeferredScheduler(name="GPIOPulseScheduler")
+        self._pulse_tokens = {}
+        
+        # 輸入變化事件的合併：硬體層已有 100ms 去抖，控制器層預設只丟棄狀態未改變的重複事件
+        self._debounce_s = 0.0
+        self._last_input_ts = 0.0
+        self._last_input_state = None
         
     def initialize(self, output_pins: list = [17, 27, 22], input_pin: int = 18,
                   enable_event_detect: bool = True) -> bool:
@@ -63,6 +75,8 @@ class GPIOController:
                 self.output_pins = output_pins
                 self.input_pin = input_pin
                 self.pin_states = {}
+                self._pin_to_index = {pin: i for i, pin in enumerate(output_pins)}
+                self._last_input_state = None
                 
                 for pin in output_pins:
                     self.pin_states[pin] = False
@@ -78,6 +92,8 @@ class GPIOController:
             
     def cleanup(self) -> None:
         """清理GPIO資源"""
+        self._pulse_scheduler.shutdown()
+        
         if self.hardware_gpio:
             try:
                 self.hardware_gpio.cleanup()
@@ -109,25 +125,27 @@ class GPIOController:
                     
                 # 設置硬體引腳狀態
                 self.hardware_gpio.set_output(pin_index, state)
+                self._cancel_pending_pulse(pin_index)
                 
                 # 記錄狀態
                 pin = self.hardware_gpio.output_pins[pin_index]
                 self.pin_states[pin] = state
                 
-                # 觸發事件
-                self._trigger_event("on_output_change", {
-                    "pin_index": pin_index,
-                    "pin": pin,
-                    "state": state,
-                    "timestamp": time.time()
-                })
-                
-                logger.debug(f"設置GPIO輸出: 索引={pin_index}, 實際引腳={pin}, 狀態={'高' if state else '低'}")
-                return True
-                
             except Exception as e:
                 logger.error(f"設置GPIO輸出出錯: {e}")
                 return False
+                
+        # 在鎖外觸發事件，回調中可再次操作GPIO；沒有監聽器時不生成事件數據
+        if self.event_listeners.get("on_output_change"):
+            self._trigger_event("on_output_change", {
+                "pin_index": pin_index,
+                "pin": pin,
+                "state": state,
+                "timestamp": time.time()
+            })
+        
+        logger.debug("設置GPIO輸出: 索引=%s, 實際引腳=%s, 狀態=%s", pin_index, pin, '高' if state else '低')
+        return True
             
     def set_output_by_gpio(self, gpio_pin: int, state: bool) -> bool:
         """直接使用GPIO號碼設置輸出引腳狀態
@@ -143,13 +161,8 @@ class GPIOController:
             return False
             
         try:
-            # 查找引腳索引
-            pin_index = None
-            for i, pin in enumerate(self.hardware_gpio.output_pins):
-                if pin == gpio_pin:
-                    pin_index = i
-                    break
-                    
+            # 查找引腳索引 (映射在初始化時建立)
+            pin_index = self._pin_to_index.get(gpio_pin)
             if pin_index is None:
                 logger.error(f"找不到GPIO引腳 {gpio_pin}")
                 return False
@@ -177,25 +190,27 @@ class GPIOController:
             try:
                 # 使用硬體控制器切換狀態
                 new_state = self.hardware_gpio.toggle_output(pin_index)
+                self._cancel_pending_pulse(pin_index)
                 
                 # 記錄狀態
                 pin = self.hardware_gpio.output_pins[pin_index]
                 self.pin_states[pin] = new_state
                 
-                # 觸發事件
-                self._trigger_event("on_output_change", {
-                    "pin_index": pin_index,
-                    "pin": pin,
-                    "state": new_state,
-                    "timestamp": time.time()
-                })
-                
-                logger.debug(f"切換GPIO輸出: 索引={pin_index}, 實際引腳={pin}, 新狀態={'高' if new_state else '低'}")
-                return new_state
-                
             except Exception as e:
                 logger.error(f"切換GPIO輸出出錯: {e}")
                 return None
+                
+        # 在鎖外觸發事件
+        if self.event_listeners.get("on_output_change"):
+            self._trigger_event("on_output_change", {
+                "pin_index": pin_index,
+                "pin": pin,
+                "state": new_state,
+                "timestamp": time.time()
+            })
+        
+        logger.debug("切換GPIO輸出: 索引=%s, 實際引腳=%s, 新狀態=%s", pin_index, pin, '高' if new_state else '低')
+        return new_state
             
     def pulse_output(self, pin_index: int, duration: float = 0.5) -> bool:
         """產生脈衝信號
@@ -212,27 +227,74 @@ class GPIOController:
             
         with self.lock:
             try:
-                # 使用硬體控制器產生脈衝
-                self.hardware_gpio.pulse_output(pin_index, duration)
+                # 設置高電位，由調度線程在脈衝結束時恢復低電位，不阻塞調用者
+                self.hardware_gpio.set_output(pin_index, True)
                 
-                # 記錄狀態（脈衝結束後為低電位）
                 pin = self.hardware_gpio.output_pins[pin_index]
-                self.pin_states[pin] = False
-                
-                # 觸發事件
-                self._trigger_event("on_pulse", {
-                    "pin_index": pin_index,
-                    "pin": pin,
-                    "duration": duration,
-                    "timestamp": time.time()
-                })
+                self.pin_states[pin] = True
                 
-                logger.debug(f"產生GPIO脈衝: 索引={pin_index}, 實際引腳={pin}, 持續時間={duration}秒")
-                return True
+                token = self._pulse_tokens.get(pin_index, 0) + 1
+                self._pulse_tokens[pin_index] = token
+                self._pulse_scheduler.call_later(duration, self._end_pulse, pin_index, token)
                 
             except Exception as e:
                 logger.error(f"產生GPIO脈衝出錯: {e}")
                 return False
+                
+        # 在鎖外觸發事件
+        if self.event_listeners.get("on_pulse"):
+            self._trigger_event("on_pulse", {
+                "pin_index": pin_index,
+                "pin": pin,
+                "duration": duration,
+                "timestamp": time.time()
+            })
+        
+        logger.debug("產生GPIO脈衝: 索引=%s, 實際引腳=%s, 持續時間=%s秒", pin_index, pin, duration)
+        return True
+            
+    def _cancel_pending_pulse(self, pin_index: int) -> None:
+        """使引腳上進行中的脈衝失效（調用者須持有 self.lock）
+        
+        明確寫入的狀態取代進行中的脈衝，脈衝到期時不再把引腳拉低
+        
+        Args:
+            pin_index: 輸出引腳索引
+        """
+        if pin_index in self._pulse_tokens:
+            self._pulse_tokens[pin_index] += 1
+            
+    def _end_pulse(self, pin_index: int, token: int) -> None:
+        """脈衝結束，恢復低電位並觸發 on_pulse_end
+        
+        脈衝已被新脈衝或 set_output/toggle_output 取代時，既不恢復低電位，
+        也不觸發 on_pulse_end
+        
+        Args:
+            pin_index: 輸出引腳索引
+            token: 脈衝序號，與當前序號不符時不處理
+        """
+        with self.lock:
+            if self._pulse_tokens.get(pin_index) != token or not self.initialized:
+                return
+                
+            try:
+                self.hardware_gpio.set_output(pin_index, False)
+                pin = self.hardware_gpio.output_pins[pin_index]
+                self.pin_states[pin] = False
+            except Exception as e:
+                logger.error(f"結束GPIO脈衝出錯: {e}")
+                return
+                
+        # 在鎖外觸發脈衝結束事件
+        if self.event_listeners.get("on_pulse_end"):
+            self._trigger_event("on_pulse_end", {
+                "pin_index": pin_index,
+                "pin": pin,
+                "timestamp": time.time()
+            })
+        
+        logger.debug("GPIO脈衝結束: 索引=%s, 實際引腳=%s", pin_index, pin)
             
     def get_input(self) -> Optional[bool]:
         """獲取輸入引腳狀態
@@ -248,7 +310,7 @@ class GPIOController:
                 # 使用硬體控制器讀取輸入
                 state = self.hardware_gpio.get_input()
                 
-                logger.debug(f"讀取GPIO輸入: 引腳={self.hardware_gpio.input_pin}, 狀態={'高' if state else '低'}")
+                logger.debug("讀取GPIO輸入: 引腳=%s, 狀態=%s", self.hardware_gpio.input_pin, '高' if state else '低')
                 return state
                 
             except Exception as e:
@@ -274,12 +336,19 @@ class GPIOController:
             callback: 回調函數
         """
         
+        # 以新元組替換舊的監聽器元組（寫時複製），觸發事件時無需加鎖
         with self.lock:
-            if event_name not in self.event_listeners:
-                self.event_listeners[event_name] = []
-                
-            self.event_listeners[event_name].append(callback)
-            logger.debug(f"已註冊GPIO事件監聽器: {event_name}")
+            self.event_listeners[event_name] = self.event_listeners.get(event_name, ()) + (callback,)
+            logger.debug("已註冊GPIO事件監聽器: %s", event_name)
+        
+    def set_debounce(self, seconds: float) -> None:
+        """設置輸入變化事件的最小間隔
+        
+        Args:
+            seconds: 最小間隔(秒)，0 表示只合併狀態相同的重複事件；
+                間隔內發生的狀態變化會被丟棄
+        """
+        self._debounce_s = max(0.0, seconds)
         
     def _on_input_change(self, state: bool) -> None:
         """輸入引腳狀態變化回調
@@ -287,14 +356,22 @@ class GPIOController:
         Args:
             state: 新狀態
         """
+        # 觸點抖動時丟棄狀態未改變或間隔過短的事件
+        now = time.monotonic()
+        if state == self._last_input_state or now - self._last_input_ts < self._debounce_s:
+            return
+        self._last_input_ts = now
+        self._last_input_state = state
+        
         # 觸發事件
-        self._trigger_event("on_input_change", {
-            "pin": self.hardware_gpio.input_pin,
-            "state": state,
-            "timestamp": time.time()
-        })
+        if self.event_listeners.get("on_input_change"):
+            self._trigger_event("on_input_change", {
+                "pin": self.hardware_gpio.input_pin,
+                "state": state,
+                "timestamp": time.time()
+            })
         
-        logger.debug(f"輸入引腳狀態變化: 引腳={self.hardware_gpio.input_pin}, 狀態={'高' if state else '低'}")
+        logger.debug("輸入引腳狀態變化: 引腳=%s, 狀態=%s", self.hardware_gpio.input_pin, '高' if state else '低')
             
     def _trigger_event(self, event_name: str, data: Any) -> None:
         """觸發事件
@@ -304,15 +381,16 @@ class GPIOController:
             data: 事件數據
         """
         
-        with self.lock:
-            if event_name not in self.event_listeners:
-                return
-                
-            for callback in self.event_listeners[event_name]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    logger.error(f"執行GPIO事件回調出錯: {e}")
+        # 監聽器元組不會被原地修改，直接讀取即可，無需加鎖複製
+        listeners = self.event_listeners.get(event_name)
+        if not listeners:
+            return
+            
+        for callback in listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"執行GPIO事件回調出錯: {e}")
                 
     def check_initialized(self) -> bool:
         """檢查是否已初始化
@@ -334,18 +412,12 @@ class GPIOController:
             }
             
             if self.initialized and self.hardware_gpio:
-                # 獲取輸出引腳映射
-                pin_mapping = self.get_pin_mapping()
-                
-                # 獲取輸出引腳狀態
-                output_states = []
-                for idx, pin in pin_mapping.items():
-                    state = self.pin_states.get(pin, False)
-                    output_states.append({
-                        "index": idx,
-                        "pin": pin,
-                        "state": state
-                    })
+                # 獲取輸出引腳狀態，直接使用初始化時建立的引腳映射，不再每次重建
+                pin_states = self.pin_states
+                output_states = [
+                    {"index": idx, "pin": pin, "state": pin_states.get(pin, False)}
+                    for pin, idx in self._pin_to_index.items()
+                ]
                     
                 # 直接使用硬體控制器獲取輸入狀態，而不是調用 self.get_input()
                 try:
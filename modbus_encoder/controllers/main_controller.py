@@ -11,7 +11,7 @@ import logging
 import threading
 from typing import Dict, Any, Optional, Union, Tuple, List, Callable
 
-from ..controllers.encoder_controller import EncoderController
+from ..controllers.encoder_controller import EncoderController, MonitorSample
 from ..controllers.gpio_controller import GPIOController
 from ..network.osc_server import OSCServer
 from ..utils.config import ConfigManager
@@ -47,6 +47,31 @@ class MainController:
         self.error_count = 0
         self.last_error = ""
         
+        # 命令分派表: 命令名稱 -> (處理函數, 依賴的子系統)
+        self._command_table = {
+            # 系統命令
+            "status": (lambda command, source: self.get_status(), None),
+            "connect": (self._handle_connect, None),
+            "disconnect": (self._handle_disconnect, None),
+            "reset": (self._handle_reset, None),
+            "get_device_info": (self._handle_get_device_info, None),
+            # 編碼器命令
+            "read_position": (self._handle_read_position, "encoder"),
+            "read_multi_position": (self._handle_read_multi_position, "encoder"),
+            "read_speed": (self._handle_read_speed, "encoder"),
+            "set_zero": (self._handle_set_zero, "encoder"),
+            # 監測命令
+            "start_monitor": (self._handle_start_monitor, None),
+            "stop_monitor": (self._handle_stop_monitor, None),
+            "list_monitors": (self._handle_list_monitors, None),
+            # GPIO命令
+            "gpio_high": (self._handle_gpio_high, "gpio"),
+            "gpio_low": (self._handle_gpio_low, "gpio"),
+            "gpio_toggle": (self._handle_gpio_toggle, "gpio"),
+            "gpio_pulse": (self._handle_gpio_pulse, "gpio"),
+            "read_input": (self._handle_read_input, "gpio"),
+        }
+        
     def initialize(self) -> bool:
         """初始化系統
         
@@ -375,64 +400,30 @@ class MainController:
                             except ValueError:
                                 command[key] = value
                 
-        cmd = command.get("command", "").strip().lower()
+        cmd = command.get("command", "").strip()
+        # 程式客戶端送來的命令通常已是小寫，此時不必再建立新字符串
+        if not cmd.islower():
+            cmd = cmd.lower()
         
         # 如果命令為空，返回錯誤
         if not cmd:
             return {"status": "error", "message": "缺少命令"}
             
         # 記錄命令
-        logger.info(f"處理命令: {cmd}, 來源: {source}")
-            
-        # 系統命令
-        if cmd == "status":
-            return self.get_status()
-        elif cmd == "connect":
-            return self._handle_connect(command, source)
-        elif cmd == "disconnect":
-            return self._handle_disconnect(command, source)
-        elif cmd == "reset":
-            return self._handle_reset(command, source)
-        elif cmd == "get_device_info":
-            return self._handle_get_device_info(command, source)
-            
-        # 編碼器命令
-        if cmd.startswith("read_") or cmd == "set_zero":
-            if not self.encoder_controller:
+        logger.info("處理命令: %s, 來源: %s", cmd, source)
+            
+        # 查表分派命令
+        entry = self._command_table.get(cmd)
+        if entry is not None:
+            handler, requires = entry
+            
+            # 檢查命令依賴的子系統是否已初始化
+            if requires == "encoder" and not self.encoder_controller:
                 return {"status": "error", "message": "編碼器控制器未初始化"}
-                
-            if cmd == "read_position":
-                return self._handle_read_position(command, source)
-            elif cmd == "read_multi_position":
-                return self._handle_read_multi_position(command, source)
-            elif cmd == "read_speed":
-                return self._handle_read_speed(command, source)
-            elif cmd == "set_zero":
-                return self._handle_set_zero(command, source)
-                
-        # 監測命令
-        if cmd == "start_monitor":
-            return self._handle_start_monitor(command, source)
-        elif cmd == "stop_monitor":
-            return self._handle_stop_monitor(command, source)
-        elif cmd == "list_monitors":
-            return self._handle_list_monitors(command, source)
-            
-        # GPIO命令
-        if cmd.startswith("gpio_") or cmd == "read_input":
-            if not self.gpio_controller:
+            if requires == "gpio" and not self.gpio_controller:
                 return {"status": "error", "message": "GPIO控制器未初始化"}
                 
-            if cmd == "gpio_high":
-                return self._handle_gpio_high(command, source)
-            elif cmd == "gpio_low":
-                return self._handle_gpio_low(command, source)
-            elif cmd == "gpio_toggle":
-                return self._handle_gpio_toggle(command, source)
-            elif cmd == "gpio_pulse":
-                return self._handle_gpio_pulse(command, source)
-            elif cmd == "read_input":
-                return self._handle_read_input(command, source)
+            return handler(command, source)
                 
         # 未知命令
         logger.warning(f"未知命令: {cmd}")
@@ -1061,8 +1052,8 @@ class MainController:
                 self._stop_continuous_task(existing_task_id)
                 
                 # 等待確認任務確實停止
-                timeout = time.time() + 1.0  # 1秒超時
-                while existing_task_id in self.continuous_tasks and time.time() < timeout:
+                timeout = time.monotonic() + 1.0  # 1秒超時
+                while existing_task_id in self.continuous_tasks and time.monotonic() < timeout:
                     time.sleep(0.05)
                     
                 # 再次確認舊任務已經不存在
@@ -1331,29 +1322,21 @@ class MainController:
         }
     
     
-    def _on_encoder_data_update(self, data: Dict[str, Any]) -> None:
+    def _on_encoder_data_update(self, data: MonitorSample) -> None:
         """編碼器資料更新事件處理器，增加重複數據檢測
         
         Args:
-            data: 事件資料
+            data: 監測數據樣本
         """
         if not self.osc_server:
             return
 
         # 從配置管理器獲取設備名稱
         device_name = self.config_manager.get_device_name()
-
-        # 添加設備名稱到數據中
-        if "device_name" not in data:
-            data["device_name"] = device_name            
             
         # 生成數據指紋用於重複數據檢測
         # 使用角度、速度和圈數作為關鍵數據點
-        data_fingerprint = (
-            data.get("angle", 0),
-            data.get("rpm", 0),
-            data.get("laps", 0)
-        )
+        data_fingerprint = (data.angle, data.rpm, data.laps)
 
         # 發送到所有任務目標
         with self.continuous_task_lock:
@@ -1376,7 +1359,7 @@ class MainController:
                 min_interval = task_info.get("interval", 0.5) / 2
                 if (last_data == data_fingerprint and 
                     (current_time - last_sent_time) < min_interval):
-                    logger.debug(f"跳過重複數據: 任務={task_id}, 時間間隔={current_time - last_sent_time:.3f}秒")
+                    logger.debug("跳過重複數據: 任務=%s, 時間間隔=%.3f秒", task_id, current_time - last_sent_time)
                     continue
                 
                 # 根據格式類型發送資料
@@ -1384,37 +1367,37 @@ class MainController:
                     result = {
                         "type": "monitor_data",
                         "task_id": task_id,
-                        "device_name": full_device_name,
-                        "address": data["address"],
-                        "timestamp": data["timestamp"],
-                        "direction": data["direction"],
-                        "angle": data["angle"],
-                        "rpm": data["rpm"],
-                        "laps": data["laps"],
-                        "raw_angle": data["raw_angle"],
-                        "raw_rpm": data["raw_rpm"]
+                        "device_name": device_name,
+                        "address": data.address,
+                        "timestamp": data.timestamp,
+                        "direction": data.direction,
+                        "angle": data.angle,
+                        "rpm": data.rpm,
+                        "laps": data.laps,
+                        "raw_angle": data.raw_angle,
+                        "raw_rpm": data.raw_rpm
                     }
                 elif format_type.lower() == "osc":
                     # OSC 格式 - 使用修改後的格式，設備名稱在地址中
-                    rpm_value = data['rpm'] if data['rpm'] is not None else 0
-                    raw_rpm_value = data['raw_rpm'] if data['raw_rpm'] is not None else 0
+                    rpm_value = data.rpm if data.rpm is not None else 0
+                    raw_rpm_value = data.raw_rpm if data.raw_rpm is not None else 0
                     
                     result = [
-                        data["address"],         # 地址
-                        data["timestamp"],       # 時間戳
-                        data["direction"],       # 方向
-                        data["angle"],           # 角度
+                        data.address,            # 地址
+                        data.timestamp,          # 時間戳
+                        data.direction,          # 方向
+                        data.angle,              # 角度
                         rpm_value,               # 轉速
-                        data["laps"],            # 圈數
-                        data["raw_angle"],       # 原始角度
+                        data.laps,               # 圈數
+                        data.raw_angle,          # 原始角度
                         raw_rpm_value            # 原始轉速
                     ]
                 else:
                     # 文本格式: 使用空格分隔
-                    rpm_value = data['rpm'] if data['rpm'] is not None else 0
-                    raw_rpm_value = data['raw_rpm'] if data['raw_rpm'] is not None else 0
+                    rpm_value = data.rpm if data.rpm is not None else 0
+                    raw_rpm_value = data.raw_rpm if data.raw_rpm is not None else 0
                     
-                    result = f"{data['address']} {data['timestamp']:.3f} {data['direction']} {data['angle']:.4f} {rpm_value:.4f} {data['laps']} {data['raw_angle']} {raw_rpm_value}\n"
+                    result = f"{data.address} {data.timestamp:.3f} {data.direction} {data.angle:.4f} {rpm_value:.4f} {data.laps} {data.raw_angle} {raw_rpm_value}\n"
 
                 # 發送資料
                 if source:
@@ -157,7 +157,7 @@ class GPIOHardware:
             
         try:
             state = GPIO.input(channel)
-            logger.debug(f"輸入引腳 {channel} 狀態變為: {state}")
+            logger.debug("輸入引腳 %s 狀態變為: %s", channel, state)
             
             # 調用註冊的回調函數
             if channel in self._input_callbacks:
@@ -213,11 +213,11 @@ class GPIOHardware:
         if GPIO_AVAILABLE:
             try:
                 GPIO.output(pin, GPIO.HIGH if state else GPIO.LOW)
-                logger.debug(f"實際設置輸出引腳 {pin} 為: {'高' if state else '低'}")
+                logger.debug("實際設置輸出引腳 %s 為: %s", pin, '高' if state else '低')
             except Exception as e:
                 logger.error(f"設置輸出引腳 {pin} 時出錯: {e}")
         else:
-            logger.debug(f"模擬設置輸出引腳 {pin} 為: {'高' if state else '低'}")
+            logger.debug("模擬設置輸出引腳 %s 為: %s", pin, '高' if state else '低')
     
     def get_input(self) -> bool:
         """獲取輸入引腳狀態
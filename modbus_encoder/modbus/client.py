@@ -125,6 +125,9 @@ class ModbusClient:
         self.rx_count = 0
         self.error_count = 0
         
+        # 最近一次成功讀取的時間（單調時鐘），供連接監視器判斷是否需要探測
+        self.last_response_time = None
+        
     def connect(self) -> bool:
         """連接設備
         
@@ -165,6 +168,26 @@ class ModbusClient:
             logger.error(f"連接設備出錯: {e}")
             return False
         
+    def can_reuse(self, port: str, baudrate: int, slave_address: int) -> bool:
+        """判斷此客戶端能否用於以指定參數重新連接
+        
+        串口在初始化時不可用（例如設備尚未插入）的客戶端不會再嘗試打開串口，需重新創建
+        
+        Args:
+            port: 串口設備路徑
+            baudrate: 波特率
+            slave_address: 從站地址(編碼器地址)
+            
+        Returns:
+            是否可以重複使用
+        """
+        return (
+            self._serial_available
+            and self.port == port
+            and self.baudrate == baudrate
+            and self.slave_address == slave_address
+        )
+        
     def close(self) -> None:
         """關閉連接"""
         if self._connected and self._serial_available:
@@ -265,12 +288,13 @@ class ModbusClient:
             self._connected = False  # 標記為未連接
             return False
             
-    def read_register(self, address: int, count: int = 1) -> Optional[Union[int, List[int]]]:
+    def read_register(self, address: int, count: int = 1, signed: bool = False) -> Optional[Union[int, List[int]]]:
         """讀取保持寄存器
         
         Args:
             address: 寄存器地址
             count: 讀取的寄存器數量
+            signed: 是否將寄存器值解析為16位帶符號數
                 
         Returns:
             讀取到的寄存器值，如果count>1則返回值列表，失敗時返回None
@@ -329,11 +353,17 @@ class ModbusClient:
                     self.error_count += 1
                     return None
                     
-                # 返回結果
+                self.last_response_time = time.monotonic()
+                
+                # 返回結果，需要時做16位二補數符號擴展
+                registers = response.registers
+                if signed:
+                    registers = [(value ^ 0x8000) - 0x8000 for value in registers]
+                    
                 if count == 1:
-                    return response.registers[0]
+                    return registers[0]
                 else:
-                    return response.registers
+                    return registers
                     
             except ModbusException as e:
                 logger.error(f"Modbus通訊錯誤: {e}")
@@ -697,25 +727,53 @@ class ModbusClient:
         Returns:
             編碼器角速度(轉/分)，失敗時返回None
         """
-        # 只讀取角速度值
-        speed_value = self.read_register(RegisterAddress.ENCODER_ANGULAR_SPEED)
+        # 只讀取角速度值，解析時即轉換為帶符號數
+        speed_value = self.read_register(RegisterAddress.ENCODER_ANGULAR_SPEED, signed=True)
         
         if speed_value is None:
             return None
             
+        return self.speed_value_to_rpm(speed_value)
+        
+    def speed_value_to_rpm(self, speed_value: int) -> float:
+        """將帶符號的角速度值換算為轉速
+        
+        Args:
+            speed_value: 帶符號的角速度寄存器值
+            
+        Returns:
+            編碼器角速度(轉/分)
+        """
         # 使用配置的分辨率和採樣時間
         resolution = self.encoder_resolution
         sampling_time_ms = self.encoder_sampling_time_ms
         
-        # 轉換為帶符號數
-        if speed_value > 32767:
-            speed_value = speed_value - 65536
-            
         # 計算公式: 編碼器角速度 = 編碼器角速度值 / 單圈分辨率 / (採樣時間/60000)
         # 採樣時間從毫秒轉換為分鐘
-        actual_speed = speed_value / resolution / (sampling_time_ms / 60000)
+        return speed_value / resolution / (sampling_time_ms / 60000)
+        
+    def read_encoder_block(self) -> Optional[Tuple[int, int, float]]:
+        """以單次請求讀取編碼器位置與角速度
+        
+        單圈值至角速度值的寄存器地址連續，一次讀取可省去多次串口往返
         
-        return actual_speed
+        Returns:
+            (單圈值, 帶符號的角速度值, 角速度(轉/分))，失敗時返回None
+        """
+        start = RegisterAddress.ENCODER_SINGLE_VALUE
+        count = RegisterAddress.ENCODER_ANGULAR_SPEED - start + 1
+        
+        registers = self.read_register(start, count)
+        if registers is None or len(registers) < count:
+            return None
+            
+        position = registers[0]
+        speed_value = registers[count - 1]
+        
+        # 轉換為帶符號數（16位二補數符號擴展）
+        speed_value = (speed_value ^ 0x8000) - 0x8000
+            
+        return position, speed_value, self.speed_value_to_rpm(speed_value)
         
     def set_encoder_zero(self) -> bool:
         """設置編碼器零點（當前位置為零點）
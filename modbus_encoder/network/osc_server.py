@@ -4,20 +4,106 @@ OSC服務器模組的改進版本
 統一地址格式，增強線程管理和資源釋放機制
 """
 import logging
+import socket
 import threading
 import time
 import queue
 import json
+from collections.abc import Iterable
 from typing import Dict, Any, Callable, Optional, Tuple, List, Union
 
 from pythonosc import dispatcher
 from pythonosc import osc_server
-from pythonosc import udp_client
+from pythonosc.osc_message_builder import OscMessageBuilder
 from pythonosc.dispatcher import Handler
 
 # 配置日誌
 logger = logging.getLogger(__name__)
 
+# 嘗試導入 orjson 以加速 JSON 序列化，若不可用則使用標準庫
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def _dumps(data: Any) -> str:
+    """將數據序列化為JSON字符串，orjson 可用時優先使用
+    
+    Args:
+        data: 要序列化的數據
+        
+    Returns:
+        JSON字符串
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            # orjson 不支援的類型（如非字符串鍵）回退到標準庫
+            pass
+    return json.dumps(data)
+
+# OSC bundle 標頭: "#bundle" 與立即執行的時間標籤
+_BUNDLE_HEADER = b"#bundle\x00" + (1).to_bytes(8, "big")
+
+
+def _osc_string(text: str) -> bytes:
+    """編碼OSC字符串（UTF-8，以空字節結尾並補齊至4字節邊界）"""
+    encoded = text.encode("utf-8")
+    return encoded + b"\x00" * (4 - len(encoded) % 4)
+
+
+class OSCDatagram:
+    """已編碼的OSC數據包，可直接交給 UDPClient.send 發送"""
+    
+    __slots__ = ("address", "dgram")
+    
+    def __init__(self, address: str, dgram: bytes):
+        """初始化OSC數據包
+        
+        Args:
+            address: OSC地址（用於日誌）
+            dgram: 數據包內容
+        """
+        self.address = address
+        self.dgram = dgram
+
+
+class UDPSender:
+    """已連接到固定目的地址的UDP發送器
+    
+    套接字在建立時 connect() 到目的地址，之後以 send() 發送，
+    內核無需為每個數據包重新查找路由；對方端口關閉時，
+    後續發送會拋出 ConnectionRefusedError，調用方只需重建發送器
+    """
+    
+    def __init__(self, ip: str, port: int):
+        """初始化UDP發送器
+        
+        Args:
+            ip: 目的IP地址
+            port: 目的端口
+        """
+        family, _, _, _, sockaddr = socket.getaddrinfo(ip, port, type=socket.SOCK_DGRAM)[0]
+        self._sock = socket.socket(family, socket.SOCK_DGRAM)
+        self._sock.connect(sockaddr)
+    
+    def send(self, content) -> None:
+        """發送已編碼的OSC消息或bundle
+        
+        Args:
+            content: 具有 dgram 屬性的OSC數據
+        """
+        self._sock.send(content.dgram)
+    
+    def close(self) -> None:
+        """關閉套接字"""
+        self._sock.close()
+
+
 class RequestContext:
     """請求上下文類，用於保存當前請求的相關信息"""
     
@@ -76,6 +162,35 @@ class EnhancedDispatcher(dispatcher.Dispatcher):
             self.context.thread_local.client_address = None
             self.context.thread_local.request_time = None
 
+class QueuedDispatcher:
+    """排隊調度器，接收線程只將數據包放入有界隊列，由處理線程調用實際調度器"""
+    
+    def __init__(self, rx_queue: queue.Queue, on_drop: Callable[[], None]):
+        """初始化排隊調度器
+        
+        Args:
+            rx_queue: 接收隊列
+            on_drop: 隊列已滿、數據包被丟棄時的回調
+        """
+        self.rx_queue = rx_queue
+        self.on_drop = on_drop
+    
+    def call_handlers_for_packet(self, data, client_address):
+        """將數據包放入隊列後立即返回
+        
+        Args:
+            data: OSC數據
+            client_address: 客戶端地址
+            
+        Returns:
+            空列表（回應由處理器自行發送）
+        """
+        try:
+            self.rx_queue.put_nowait((data, client_address))
+        except queue.Full:
+            self.on_drop()
+        return []
+
 class OSCServer:
     """OSC服務器類
     
@@ -107,9 +222,20 @@ class OSCServer:
         
         self.server = None
         self.server_thread = None
+        self.request_thread = None
+        self.rx_queue = queue.Queue(maxsize=1024)  # 待處理的接收數據包
         self.running = False
         self.message_queue = queue.Queue()
         self.send_thread = None
+        self.send_batch_size = 64  # 發送線程每次喚醒最多處理的消息數
+        self.max_bundle_size = 1400  # 合併發送的bundle上限（位元組），保持在以太網MTU內
+        
+        # UDP發送器快取，按目的地址重用，避免每次發送都建立新套接字
+        self._client_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # 單字符串參數消息的前綴快取（地址 + ",s" 類型標籤），地址 -> 已編碼字節
+        self._string_prefixes = {}
         
         # 使用增強型調度器
         self.dispatcher = EnhancedDispatcher(self.context)
@@ -184,18 +310,21 @@ class OSCServer:
                 except queue.Empty:
                     continue
                     
-                # 解析消息
-                client_address, data, format_type = message
-                
-                # 發送消息
-                success = self._send_data(client_address, data, format_type)
-                
-                if not success:
-                    # 發送失敗，可以選擇重新放入隊列或記錄錯誤
-                    logger.error(f"發送消息到 {client_address} 失敗")
+                # 一次取出隊列中已累積的消息，整批發送，減少線程喚醒次數
+                batch = [message]
+                while len(batch) < self.send_batch_size:
+                    try:
+                        batch.append(self.message_queue.get_nowait())
+                    except queue.Empty:
+                        break
                 
-                # 標記任務完成
-                self.message_queue.task_done()
+                try:
+                    # 同一客戶端的多條消息合併為一個數據包發送
+                    self._send_batch(batch)
+                finally:
+                    # 標記任務完成
+                    for _ in batch:
+                        self.message_queue.task_done()
                 
             except Exception as e:
                 logger.error(f"發送執行緒出錯: {e}")
@@ -203,24 +332,215 @@ class OSCServer:
         
         logger.debug("發送線程已終止")
     
-    def _send_data(self, client_address, data, format_type):
-        """實際發送數據
+    def _get_client(self, ip: str, port: int) -> UDPSender:
+        """獲取指定地址的UDP發送器，首次使用時建立並快取
         
-        將數據格式從逗號分隔修改為空格分隔
+        Args:
+            ip: 目的IP地址
+            port: 目的端口
+            
+        Returns:
+            該地址對應的UDP發送器
+        """
+        key = (ip, port)
+        client = self._client_cache.get(key)
+        if client is None:
+            with self._cache_lock:
+                client = self._client_cache.get(key)
+                if client is None:
+                    client = UDPSender(ip, port)
+                    self._client_cache[key] = client
+        return client
+    
+    def _discard_client(self, client_address) -> None:
+        """移除並關閉快取中的UDP發送器，下次發送時重新建立
         
         Args:
             client_address: 客戶端地址
+        """
+        with self._cache_lock:
+            client = self._client_cache.pop((client_address[0], self.return_port), None)
+        if client:
+            client.close()
+    
+    def _resolve_device_name(self, data: Any) -> str:
+        """獲取發送地址所用的設備名稱
+        
+        Args:
+            data: 要發送的數據
+            
+        Returns:
+            設備名稱
+        """
+        if isinstance(data, dict) and "device_name" in data:
+            return data.get("device_name")
+            
+        # 嘗試從配置中獲取設備名稱
+        device_config = self.command_handler({"command": "get_device_info"}, None) if self.command_handler else None
+        if device_config and "device_name" in device_config:
+            return device_config["device_name"]
+        return "unknown"
+    
+    def _build_message(self, data: Any, format_type: str, device_name: str):
+        """根據數據格式構建OSC消息
+        
+        將數據格式從逗號分隔修改為空格分隔，使用統一的地址格式: /{device_name}/{command_type}
+        
+        Args:
             data: 要發送的數據
             format_type: 數據格式
+            device_name: 設備名稱
             
         Returns:
-            是否發送成功
+            構建完成的OSC消息，數據無法序列化時返回None
+        """
+        if format_type.lower() == "json":
+            # 確定正確的地址前缀
+            address = f"/{device_name}/response"
+            
+            # 根據數據類型確定更具體的地址
+            if isinstance(data, dict):
+                if "type" in data:
+                    if data["type"] == "monitor_data":
+                        address = f"/{device_name}/encoder/data"
+                    elif data["type"] == "zero_set":
+                        address = f"/{device_name}/encoder/zero_set"
+                    elif data["type"] == "start_monitor":
+                        address = f"/{device_name}/encoder/monitor/start"
+                    elif data["type"] == "stop_monitor":
+                        address = f"/{device_name}/encoder/monitor/stop"
+                    elif data["type"] == "monitor_error":
+                        address = f"/{device_name}/encoder/error"
+                    else:
+                        # 使用type值作為地址的一部分
+                        address = f"/{device_name}/{data['type']}"
+                elif "command" in data:
+                    cmd = data.get("command", "")
+                    if cmd.startswith("gpio_"):
+                        address = f"/{device_name}/gpio/response"
+                    elif cmd == "read_input":
+                        address = f"/{device_name}/gpio/input"
+            
+            # 轉換為JSON字符串，增加容錯性
+            try:
+                if isinstance(data, (dict, list)):
+                    value = _dumps(data)
+                else:
+                    value = str(data)
+            except (TypeError, ValueError) as e:
+                logger.error(f"JSON數據格式錯誤: {e}, 數據: {str(data)[:100]}...")
+                return None
+                
+        elif format_type.lower() == "osc":
+            if isinstance(data, list):
+                # 新格式: /{device_name}/encoder/data
+                address = f"/{device_name}/encoder/data"
+                value = data
+                
+            elif isinstance(data, dict):
+                if "type" in data and data["type"] == "monitor_data":
+                    # 監測數據特殊處理
+                    address = f"/{device_name}/encoder/data"
+                    
+                    # 構建參數列表，移除設備名稱
+                    rpm_value = data.get("rpm", 0) if data.get("rpm") is not None else 0
+                    raw_rpm_value = data.get("raw_rpm", 0) if data.get("raw_rpm") is not None else 0
+                    
+                    value = [
+                        data.get("address", 0),            # 地址
+                        data.get("timestamp", time.time()),# 時間戳
+                        data.get("direction", 0),          # 方向
+                        data.get("angle", 0),              # 角度
+                        rpm_value,                         # 轉速
+                        data.get("laps", 0),               # 圈數
+                        data.get("raw_angle", 0),          # 原始角度
+                        raw_rpm_value                      # 原始轉速
+                    ]
+                else:
+                    # 其他類型的字典數據
+                    address = f"/{device_name}/response"
+                    if "type" in data:
+                        type_value = data["type"]
+                        address = f"/{device_name}/{type_value}"
+                    
+                    # 提取常見字段
+                    status = data.get("status", "unknown")
+                    message = data.get("message", "")
+                    
+                    # 構建參數列表
+                    value = [status]
+                    if message:
+                        value.append(message)
+            else:
+                # 其他類型數據直接發送
+                address = f"/{device_name}/data"
+                value = data
+                    
+        else:  # 文本格式
+            # 統一地址格式為 /{device_name}/text
+            address = f"/{device_name}/text"
+            
+            # 如果是編碼器數據，使用統一的格式
+            if isinstance(data, dict) and data.get("type") == "monitor_data":
+                # 構建空格分隔的文本數據
+                addr = data.get("address", 0)
+                timestamp = data.get("timestamp", time.time())
+                direction = data.get("direction", 0)
+                angle = data.get("angle", 0)
+                rpm = data.get("rpm", 0) if data.get("rpm") is not None else 0
+                laps = data.get("laps", 0)
+                raw_angle = data.get("raw_angle", 0)
+                raw_rpm = data.get("raw_rpm", 0) if data.get("raw_rpm") is not None else 0
+                
+                value = f"{addr} {timestamp:.3f} {direction} {angle:.4f} {rpm:.4f} {laps} {raw_angle} {raw_rpm}"
+            elif isinstance(data, str):
+                # 將原先的逗號分隔格式轉換為空格分隔
+                parts = data.strip().split(",") if "," in data else []
+                if len(parts) >= 8:
+                    value = " ".join(parts)
+                else:
+                    # 作為純文本發送
+                    value = data
+            elif isinstance(data, (dict, list)):
+                # 將數據轉換為字符串
+                value = _dumps(data)
+            else:
+                value = str(data)
+        
+        # 單個字符串參數（JSON與文本格式）直接拼接預先編碼的前綴
+        if isinstance(value, str):
+            prefix = self._string_prefixes.get(address)
+            if prefix is None:
+                prefix = _osc_string(address) + b",s\x00\x00"
+                self._string_prefixes[address] = prefix
+            return OSCDatagram(address, prefix + _osc_string(value))
+        
+        # 其他參數形式使用構建器（參數規則與 SimpleUDPClient.send_message 一致）
+        builder = OscMessageBuilder(address=address)
+        if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            values = [value]
+        else:
+            values = value
+        for arg in values:
+            builder.add_arg(arg)
+        return OSCDatagram(address, builder.build().dgram)
+    
+    def _prepare_message(self, client_address, data, format_type):
+        """檢查目的地址並構建待發送的OSC消息
+        
+        Args:
+            client_address: 客戶端地址
+            data: 要發送的數據
+            format_type: 數據格式
+            
+        Returns:
+            (返回地址, OSC消息) 元組，地址無效或數據無法序列化時返回None
         """
         # 添加對None客戶端地址的檢查
         if client_address is None:
             logger.error("客戶端地址為空，無法發送數據")
             self.error_count += 1
-            return False
+            return None
             
         try:
             # 確保使用正確的返回端口
@@ -232,190 +552,54 @@ class OSCServer:
             if not isinstance(client_address[0], str) or not isinstance(client_address[1], int):
                 logger.error(f"客戶端地址格式無效: {client_address}")
                 self.error_count += 1
-                return False
+                return None
                 
-            # 創建OSC客戶端
-            client = udp_client.SimpleUDPClient(
-                client_address[0], 
-                client_address[1]
-            )
-            
-            # 獲取設備名稱
-            device_name = "unknown"
-            if isinstance(data, dict) and "device_name" in data:
-                device_name = data.get("device_name")
-            else:
-                # 嘗試從配置中獲取設備名稱
-                device_config = self.command_handler({"command": "get_device_info"}, None) if self.command_handler else None
-                if device_config and "device_name" in device_config:
-                    device_name = device_config["device_name"]
-            
             if isinstance(data, dict) and "timestamp" in data:
-                logger.debug(f"發送前的時間戳: {data['timestamp']}")
+                logger.debug("發送前的時間戳: %s", data['timestamp'])
             
-            # 根據格式發送數據，使用統一的地址格式: /{device_name}/{command_type}
-            if format_type.lower() == "json":
-                # 確定正確的地址前缀
-                address = f"/{device_name}/response"
-                
-                # 根據數據類型確定更具體的地址
-                if isinstance(data, dict):
-                    if "type" in data:
-                        if data["type"] == "monitor_data":
-                            address = f"/{device_name}/encoder/data"
-                        elif data["type"] == "zero_set":
-                            address = f"/{device_name}/encoder/zero_set"
-                        elif data["type"] == "start_monitor":
-                            address = f"/{device_name}/encoder/monitor/start"
-                        elif data["type"] == "stop_monitor":
-                            address = f"/{device_name}/encoder/monitor/stop"
-                        elif data["type"] == "monitor_error":
-                            address = f"/{device_name}/encoder/error"
-                        else:
-                            # 使用type值作為地址的一部分
-                            address = f"/{device_name}/{data['type']}"
-                    elif "command" in data:
-                        cmd = data.get("command", "")
-                        if cmd.startswith("gpio_"):
-                            address = f"/{device_name}/gpio/response"
-                        elif cmd == "read_input":
-                            address = f"/{device_name}/gpio/input"
-                
-                # 轉換為JSON字符串，增加容錯性
-                try:
-                    if isinstance(data, (dict, list)):
-                        json_data = json.dumps(data)
-                    else:
-                        json_data = str(data)
-                        
-                    client.send_message(address, json_data)
-                    logger.debug(f"發送JSON數據到: {address}")
-                except (TypeError, ValueError) as e:
-                    logger.error(f"JSON數據格式錯誤: {e}, 數據: {str(data)[:100]}...")
-                    self.error_count += 1
-                    return False
-                    
-            elif format_type.lower() == "osc":
-                # 使用統一的地址格式
-                if isinstance(data, list):
-                    # 新格式: /{device_name}/encoder/data
-                    address = f"/{device_name}/encoder/data"
-                    client.send_message(address, data)
-                    logger.debug(f"發送OSC數據到: {address}")
-                    
-                elif isinstance(data, dict):
-                    if "type" in data and data["type"] == "monitor_data":
-                        # 監測數據特殊處理
-                        address = f"/{device_name}/encoder/data"
-                        
-                        # 構建參數列表，移除設備名稱
-                        rpm_value = data.get("rpm", 0) if data.get("rpm") is not None else 0
-                        raw_rpm_value = data.get("raw_rpm", 0) if data.get("raw_rpm") is not None else 0
-                        
-                        params = [
-                            data.get("address", 0),            # 地址
-                            data.get("timestamp", time.time()),# 時間戳
-                            data.get("direction", 0),          # 方向
-                            data.get("angle", 0),              # 角度
-                            rpm_value,                         # 轉速
-                            data.get("laps", 0),               # 圈數
-                            data.get("raw_angle", 0),          # 原始角度
-                            raw_rpm_value                      # 原始轉速
-                        ]
-                        client.send_message(address, params)
-                        logger.debug(f"發送OSC監測數據到: {address}")
-                        return True
-                    else:
-                        # 其他類型的字典數據
-                        address = f"/{device_name}/response"
-                        if "type" in data:
-                            type_value = data["type"]
-                            address = f"/{device_name}/{type_value}"
-                        
-                        # 提取常見字段
-                        status = data.get("status", "unknown")
-                        message = data.get("message", "")
-                        
-                        # 構建參數列表
-                        params = [status]
-                        if message:
-                            params.append(message)
-                        
-                        client.send_message(address, params)
-                        logger.debug(f"發送OSC回應到: {address}")
-                else:
-                    # 其他類型數據直接發送
-                    client.send_message(f"/{device_name}/data", data)
-                    logger.debug(f"發送其他OSC數據到: /{device_name}/data")
-                        
-            else:  # 文本格式
-                # 統一地址格式為 /{device_name}/text
-                address = f"/{device_name}/text"
+            message = self._build_message(data, format_type, self._resolve_device_name(data))
+            if message is None:
+                self.error_count += 1
+                return None
                 
-                # 如果是編碼器數據，使用統一的格式
-                if isinstance(data, dict) and data.get("type") == "monitor_data":
-                    # 構建空格分隔的文本數據
-                    addr = data.get("address", 0)
-                    timestamp = data.get("timestamp", time.time())
-                    direction = data.get("direction", 0)
-                    angle = data.get("angle", 0)
-                    rpm = data.get("rpm", 0) if data.get("rpm") is not None else 0
-                    laps = data.get("laps", 0)
-                    raw_angle = data.get("raw_angle", 0)
-                    raw_rpm = data.get("raw_rpm", 0) if data.get("raw_rpm") is not None else 0
-                    
-                    text_data = f"{addr} {timestamp:.3f} {direction} {angle:.4f} {rpm:.4f} {laps} {raw_angle} {raw_rpm}"
-                    client.send_message(address, text_data)
-                    logger.debug(f"發送文本監測數據到: {address}")
-                elif isinstance(data, str):
-                    # 檢查是否為原先的逗號分隔格式
-                    if "," in data:
-                        # 將逗號分隔轉換為空格分隔
-                        parts = data.strip().split(",")
-                        if len(parts) >= 8:
-                            # 發送到特定地址
-                            address = f"/{device_name}/text"
-                            data_without_device = " ".join(parts) 
-                            client.send_message(address, data_without_device)
-                            logger.debug(f"發送轉換文本數據到: {address}")
-                        else:
-                            # 作為純文本發送
-                            address = f"/{device_name}/text"
-                            client.send_message(address, data)
-                            logger.debug(f"發送純文本數據到: {address}")
-                    else:
-                        # 直接發送原文本
-                        address = f"/{device_name}/text"
-                        client.send_message(address, data)
-                        logger.debug(f"發送原始文本數據到: {address}")
-                else:
-                    # 將數據轉換為字符串
-                    if isinstance(data, (dict, list)):
-                        text_data = json.dumps(data)
-                    else:
-                        text_data = str(data)
-                        
-                    # 發送文本數據
-                    address = f"/{device_name}/text"
-                    client.send_message(address, text_data)
-                    logger.debug(f"發送格式化文本數據到: {address}")
+            return client_address, message
+        except Exception as e:
+            logger.error(f"發送數據出錯: {e}")
+            self.error_count += 1
+            return None
+    
+    def _deliver(self, client_address, content, message_count: int = 1) -> bool:
+        """發送已構建的OSC消息或bundle
+        
+        Args:
+            client_address: 返回地址
+            content: OSC消息或bundle
+            message_count: 包含的消息數量，用於統計
+            
+        Returns:
+            是否發送成功
+        """
+        try:
+            # 獲取（或建立）該地址的OSC客戶端
+            client = self._get_client(client_address[0], client_address[1])
+            client.send(content)
             
             # 更新計數器
-            self.tx_count += 1
-            logger.debug(f"成功發送數據到 {client_address}")
+            self.tx_count += message_count
+            logger.debug("成功發送 %d 條數據到 %s", message_count, client_address)
             return True
         except ConnectionRefusedError:
-            # 特別處理連線被拒絕的情況
-            logger.warning(f"連線被拒絕: {client_address}，可能客戶端已關閉")
-            
-            # 從客戶端列表中移除
-            self._remove_disconnected_client(client_address)
+            # 已連接的UDP套接字會在下次發送時回報先前的 ICMP 端口不可達，
+            # 客戶端的接收端口可能只是暫時關閉，只丟棄快取的發送器，不取消客戶端的註冊
+            logger.warning(f"連線被拒絕: {client_address}，客戶端接收端口可能暫時關閉")
+            self._discard_client(client_address)
             self.error_count += 1
             return False
         except OSError as e:
             # 處理網絡相關錯誤
             logger.error(f"網絡錯誤: {e}")
             if "No route to host" in str(e) or "Network is unreachable" in str(e):
+                self._discard_client(client_address)
                 self._remove_disconnected_client(client_address)
             self.error_count += 1
             return False
@@ -423,6 +607,65 @@ class OSCServer:
             logger.error(f"發送數據出錯: {e}")
             self.error_count += 1
             return False
+    
+    def _send_data(self, client_address, data, format_type):
+        """實際發送數據
+        
+        Args:
+            client_address: 客戶端地址
+            data: 要發送的數據
+            format_type: 數據格式
+            
+        Returns:
+            是否發送成功
+        """
+        prepared = self._prepare_message(client_address, data, format_type)
+        if prepared is None:
+            return False
+            
+        client_address, message = prepared
+        logger.debug("發送數據到: %s", message.address)
+        return self._deliver(client_address, message)
+    
+    def _send_batch(self, batch) -> None:
+        """發送一批消息，同一目的地址的多條消息合併為OSC bundle
+        
+        單個bundle不超過 max_bundle_size 位元組，避免IP分片
+        
+        Args:
+            batch: (客戶端地址, 數據, 格式) 元組列表
+        """
+        # 按目的地址分組，保持各地址內的消息順序
+        groups = {}
+        for client_address, data, format_type in batch:
+            prepared = self._prepare_message(client_address, data, format_type)
+            if prepared is None:
+                logger.error(f"發送消息到 {client_address} 失敗")
+                continue
+            target, message = prepared
+            groups.setdefault(target, []).append(message)
+            
+        for target, messages in groups.items():
+            if len(messages) == 1:
+                self._deliver(target, messages[0])
+                continue
+                
+            # bundle 標頭佔16位元組，每條消息另加4位元組長度前綴
+            parts = [_BUNDLE_HEADER]
+            bundle_size = len(_BUNDLE_HEADER)
+            count = 0
+            for message in messages:
+                message_size = 4 + len(message.dgram)
+                if count and bundle_size + message_size > self.max_bundle_size:
+                    self._deliver(target, OSCDatagram("#bundle", b"".join(parts)), count)
+                    parts = [_BUNDLE_HEADER]
+                    bundle_size = len(_BUNDLE_HEADER)
+                    count = 0
+                parts.append(len(message.dgram).to_bytes(4, "big"))
+                parts.append(message.dgram)
+                bundle_size += message_size
+                count += 1
+            self._deliver(target, OSCDatagram("#bundle", b"".join(parts)), count)
 
 
     def _remove_disconnected_client(self, client_address):
@@ -492,17 +735,25 @@ class OSCServer:
             return True
             
         try:
-            # 創建OSC服務器
-            self.server = osc_server.ThreadingOSCUDPServer(
+            # 創建OSC服務器，接收線程只負責入隊，不再為每個請求建立線程
+            self.server = osc_server.BlockingOSCUDPServer(
                 (self.host, self.port), 
-                self.dispatcher
+                QueuedDispatcher(self.rx_queue, self._on_rx_dropped)
             )
             
             # 標記為運行中
             self.running = True
             
+            # 發送線程在初始化時因尚未運行而立即退出，此處確保其運行
+            self._start_send_thread()
+            
+            # 啟動請求處理線程，依序處理接收隊列中的數據包
+            self.request_thread = threading.Thread(target=self._request_worker, name="OSCRequestThread")
+            self.request_thread.daemon = True
+            self.request_thread.start()
+            
             # 啟動服務器線程
-            self.server_thread = threading.Thread(target=self._server_thread)
+            self.server_thread = threading.Thread(target=self._server_thread, name="OSCServerThread")
             self.server_thread.daemon = True
             self.server_thread.start()
             
@@ -520,13 +771,21 @@ class OSCServer:
     def _start_heartbeat(self):
         """啟動心跳機制以保持連線活躍"""
         def heartbeat_task():
+            # 以單調時鐘的絕對期限排程，避免漂移，停止時立即喚醒
+            next_deadline = time.monotonic() + self.heartbeat_interval
             while self.running:
                 try:
-                    # 使用合理的間隔（修改自 240 秒到 120 秒）
-                    time.sleep(self.heartbeat_interval)
+                    if self.stop_heartbeat_event.wait(max(0.0, next_deadline - time.monotonic())):
+                        break
                     if not self.running:  # 重要：確保在等待期間沒有停止運行
                         break
                         
+                    # 計算下一次期限，若已錯過則跳過落後的週期
+                    next_deadline += self.heartbeat_interval
+                    now = time.monotonic()
+                    if now > next_deadline:
+                        next_deadline = now + self.heartbeat_interval
+                        
                     # 獲取設備名稱（原有邏輯）
                     device_info = None
                     if self.command_handler:
@@ -551,6 +810,7 @@ class OSCServer:
                     # 不中斷循環，保證心跳持續運行
 
         # 啟動心跳線程（保持原有實現）
+        self.stop_heartbeat_event.clear()
         self.heartbeat_thread = threading.Thread(target=heartbeat_task, name="HeartbeatThread")
         self.heartbeat_thread.daemon = True
         self.heartbeat_thread.start()
@@ -609,6 +869,23 @@ class OSCServer:
             except Exception as e:
                 logger.error(f"等待服務器線程終止時出錯: {e}")
         
+        # 關閉快取的UDP發送器
+        with self._cache_lock:
+            clients = list(self._client_cache.values())
+            self._client_cache.clear()
+        for client in clients:
+            client.close()
+        
+        # 等待請求處理線程終止
+        if self.request_thread and self.request_thread.is_alive():
+            try:
+                logger.debug("等待請求處理線程終止...")
+                self.request_thread.join(timeout=2.0)
+                if self.request_thread.is_alive():
+                    logger.warning("請求處理線程無法在 2 秒內終止")
+            except Exception as e:
+                logger.error(f"等待請求處理線程終止時出錯: {e}")
+        
         logger.info("OSC服務器已停止")
         
     def _stop_server(self):
@@ -625,15 +902,38 @@ class OSCServer:
         """服務器線程"""
         logger.info("OSC服務器線程已啟動")
         
+        # serve_forever 可由 shutdown() 正常結束，單個請求的錯誤不會中斷循環
+        try:
+            self.server.serve_forever(poll_interval=0.5)
+        except Exception as e:
+            if self.running:  # 只有在運行時才記錄錯誤
+                logger.error(f"處理OSC請求出錯: {e}")
+                self.error_count += 1
+                    
+        logger.info("OSC服務器線程已結束")
+        
+    def _request_worker(self) -> None:
+        """請求處理線程，從接收隊列取出數據包並交由調度器處理"""
+        logger.debug("OSC請求處理線程已啟動")
+        
         while self.running:
             try:
-                self.server.handle_request()
+                data, client_address = self.rx_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+                
+            try:
+                self.dispatcher.call_handlers_for_packet(data, client_address)
             except Exception as e:
-                if self.running:  # 只有在運行時才記錄錯誤
-                    logger.error(f"處理OSC請求出錯: {e}")
-                    self.error_count += 1
-                    
-        logger.info("OSC服務器線程已結束")
+                logger.error(f"處理OSC請求出錯: {e}")
+                self.error_count += 1
+                
+        logger.debug("OSC請求處理線程已終止")
+        
+    def _on_rx_dropped(self) -> None:
+        """接收隊列已滿時丟棄數據包"""
+        self.error_count += 1
+        logger.warning("OSC接收隊列已滿，丟棄數據包")
         
     def _default_handler(self, address: str, *args) -> None:
         """默認OSC消息處理器
@@ -642,7 +942,7 @@ class OSCServer:
             address: OSC地址
             *args: OSC參數
         """
-        logger.debug(f"收到未註冊的OSC消息: {address} {args}")
+        logger.debug("收到未註冊的OSC消息: %s %s", address, args)
         self.rx_count += 1
         
         # 獲取當前請求的客戶端地址
@@ -684,7 +984,7 @@ class OSCServer:
             address: OSC地址
             *args: OSC參數
         """
-        logger.debug(f"收到命令: {address} {args}")
+        logger.debug("收到命令: %s %s", address, args)
         self.rx_count += 1
         
         # 獲取當前請求的客戶端地址
@@ -736,7 +1036,7 @@ class OSCServer:
             address: OSC地址
             *args: OSC參數
         """
-        logger.debug(f"收到編碼器命令: {address} {args}")
+        logger.debug("收到編碼器命令: %s %s", address, args)
         self.rx_count += 1
         
         # 獲取當前請求的客戶端地址
@@ -1058,7 +1358,7 @@ class OSCServer:
             address: OSC地址
             *args: OSC參數
         """
-        logger.debug(f"收到GPIO命令: {address} {args}")
+        logger.debug("收到GPIO命令: %s %s", address, args)
         self.rx_count += 1
         
         # 獲取當前請求的客戶端地址
@@ -1313,7 +1613,7 @@ class OSCServer:
             # 保留IP地址，修改端口為返回端口
             client_address = (client_address[0], self.return_port)
         
-        logger.debug(f"發送數據: {client_address}, {data}, {format_type}")
+        logger.debug("發送數據: %s, %s, %s", client_address, data, format_type)
         self.message_queue.put((client_address, data, format_type))
         return True
     
@@ -1332,39 +1632,60 @@ class OSCServer:
         failed_clients = []
         current_time = time.time()
         expired_time = 300  # 5分鐘無活動視為過期
+        
+        # 設備名稱對所有客戶端相同，每種格式的消息只構建一次
+        device_name = self._resolve_device_name(data)
+        messages = {}
 
-        with self.clients_lock:  # 使用鎖保護
-            # 遍歷所有客戶端
-            for client_key, client_info in list(self.clients.items()):
-                # 檢查是否過期
-                if current_time - client_info["last_seen"] > expired_time:
-                    logger.debug(f"移除過期客戶端: {client_info['address']}")
-                    failed_clients.append(client_key)
-                    continue
+        # 只在複製客戶端快照時持有鎖，發送期間不阻塞服務器線程更新客戶端記錄
+        with self.clients_lock:
+            clients_snapshot = list(self.clients.items())
 
-                # 發送數據
-                try:
-                    # 獲取原始客戶端地址並修改端口為返回端口
-                    client_addr = client_info["address"]
-                    client_addr = (client_addr[0], self.return_port)
-                    
-                    # 使用_send_data統一處理發送邏輯
-                    if self._send_data(client_addr, data, 
-                                    client_info.get("format", "json")):
-                        success_count += 1
-                    else:
-                        # 如果發送失敗，記錄失敗的客戶端
-                        failed_clients.append(client_key)
-                except Exception as e:
-                    logger.error(f"廣播消息出錯: {e}")
+        # 遍歷所有客戶端
+        for client_key, client_info in clients_snapshot:
+            # 檢查是否過期
+            if current_time - client_info["last_seen"] > expired_time:
+                logger.debug(f"移除過期客戶端: {client_info['address']}")
+                failed_clients.append(client_key)
+                continue
+
+            # 發送數據
+            try:
+                # 獲取原始客戶端地址並修改端口為返回端口
+                client_addr = client_info["address"]
+                client_addr = (client_addr[0], self.return_port)
+                
+                format_type = client_info.get("format", "json")
+                if format_type not in messages:
+                    messages[format_type] = self._build_message(data, format_type, device_name)
+                message = messages[format_type]
+                
+                if message is None:
                     self.error_count += 1
-                    failed_clients.append(client_key)
-            
-            # 移除失敗的客戶端
-            for client_key in failed_clients:
-                if client_key in self.clients:
-                    logger.info(f"從廣播中移除失敗的客戶端: {client_key}")
-                    del self.clients[client_key]
+                    continue
+                    
+                # 重用已編碼的數據包，直接發送到該客戶端
+                self._get_client(client_addr[0], client_addr[1]).send(message)
+                self.tx_count += 1
+                success_count += 1
+            except ConnectionRefusedError:
+                # 單次發送被拒絕不代表客戶端已離開，只重建發送器，保留其訂閱
+                logger.warning(f"廣播被拒絕: {client_addr}，客戶端接收端口可能暫時關閉")
+                self.error_count += 1
+                self._discard_client(client_addr)
+            except Exception as e:
+                logger.error(f"廣播消息出錯: {e}")
+                self.error_count += 1
+                self._discard_client(client_addr)
+                failed_clients.append(client_key)
+        
+        # 移除失敗的客戶端
+        if failed_clients:
+            with self.clients_lock:
+                for client_key in failed_clients:
+                    if client_key in self.clients:
+                        logger.info(f"從廣播中移除失敗的客戶端: {client_key}")
+                        del self.clients[client_key]
 
         return success_count
 
@@ -183,10 +183,10 @@ def handle_monitor_command(args):
     def data_callback(data):
         if format_type == "json":
             import json
-            print(json.dumps(data, ensure_ascii=False))
+            print(json.dumps(data.to_dict(), ensure_ascii=False))
         else:
             # CSV 格式
-            print(data, end="")
+            print(data.to_dict(), end="")
     
     # 註冊資料更新事件監聽器
     encoder_controller.register_event_listener("on_data_update", data_callback)
@@ -745,8 +745,12 @@ def interactive_mode():
                 elif cmd == "status":
                     show_status()
                 elif cmd == "clear":
-                    # 清除屏幕
-                    os.system('cls' if os.name == 'nt' else 'clear')
+                    # 清除屏幕（ANSI 轉義序列，無需啟動外部程序）
+                    if os.name == 'nt':
+                        os.system('cls')
+                    else:
+                        sys.stdout.write("\x1b[2J\x1b[H")
+                        sys.stdout.flush()
                     print("===== JHS-EncoderReader 互動模式 =====")
                     print("輸入 'help' 獲取命令列表，'exit' 退出程式")
                 elif cmd in command_categories["Modbus命令"]:
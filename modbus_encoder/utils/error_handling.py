@@ -4,6 +4,7 @@
 提供統一的異常類型和處理機制，確保系統穩定運行
 """
 import logging
+import random
 import traceback
 import time
 from typing import Dict, Any, Optional, Callable, Union, Tuple, List
@@ -52,13 +53,26 @@ class ResourceError(EncoderSystemError):
     def __init__(self, message: str, error_code: int = 6000):
         super().__init__(message, error_code)
 
+def _backoff_delay(retry_delay: float, retries: int, max_delay: Optional[float]) -> float:
+    """計算第 retries 次重試前的等待時間
+    
+    指數退避並乘以 0.5~1.5 的隨機因子，避免多個調用方同時重試
+    """
+    delay = retry_delay * (2 ** (retries - 1)) * (0.5 + random.random())
+    if max_delay is not None and delay > max_delay:
+        delay = max_delay
+    return delay
+
+
 def execute_with_retry(
     func: Callable, 
     *args, 
     max_retries: int = 3, 
     retry_delay: float = 0.5,
+    max_delay: Optional[float] = None,
     exception_types: Tuple[Exception] = (Exception,),
     on_retry: Optional[Callable[[int, Exception], None]] = None,
+    is_success: Optional[Callable[[Any], bool]] = None,
     **kwargs
 ) -> Any:
     """通用重試執行器
@@ -68,8 +82,10 @@ def execute_with_retry(
         *args: 函數參數
         max_retries: 最大重試次數
         retry_delay: 初始重試延遲（秒，每次重試會增加）
+        max_delay: 單次重試延遲上限（秒），None 表示不設上限
         exception_types: 捕獲並重試的異常類型
         on_retry: 重試時的回調，接收 (重試次數, 異常) 參數
+        is_success: 判斷返回值是否成功的函數，None 時使用默認的返回格式判斷
         **kwargs: 函數關鍵字參數
         
     Returns:
@@ -85,8 +101,12 @@ def execute_with_retry(
         try:
             result = func(*args, **kwargs)
             
+            # 調用方提供的判斷優先
+            if is_success is not None:
+                if is_success(result):
+                    return result
             # 處理特殊的返回格式
-            if isinstance(result, tuple) and len(result) >= 1 and isinstance(result[0], bool):
+            elif isinstance(result, tuple) and len(result) >= 1 and isinstance(result[0], bool):
                 if result[0]:  # 如果成功
                     return result
             elif isinstance(result, dict) and "status" in result:
@@ -103,8 +123,8 @@ def execute_with_retry(
                 if on_retry:
                     on_retry(retries, ValueError("返回值表示操作失敗"))
                 
-                # 進行指數退避重試
-                delay = retry_delay * (2 ** (retries - 1))  # 指數退避
+                # 進行帶隨機抖動的指數退避重試
+                delay = _backoff_delay(retry_delay, retries, max_delay)
                 logger.warning(f"操作失敗，將在 {delay:.1f} 秒後重試 ({retries}/{max_retries})")
                 time.sleep(delay)
         
@@ -116,8 +136,8 @@ def execute_with_retry(
                 if on_retry:
                     on_retry(retries, e)
                 
-                # 進行指數退避重試
-                delay = retry_delay * (2 ** (retries - 1))  # 指數退避
+                # 進行帶隨機抖動的指數退避重試
+                delay = _backoff_delay(retry_delay, retries, max_delay)
                 logger.warning(f"操作出錯，將在 {delay:.1f} 秒後重試 ({retries}/{max_retries}): {e}")
                 time.sleep(delay)
             else:
@@ -128,11 +148,11 @@ def execute_with_retry(
     if last_exception:
         # 包裝為自定義異常
         if isinstance(last_exception, ConnectionError):
-            raise ConnectionError(f"連接失敗: {last_exception}")
+            raise ConnectionError(f"連接失敗: {last_exception}") from last_exception
         elif isinstance(last_exception, DeviceError):
-            raise DeviceError(f"設備操作失敗: {last_exception}")
+            raise DeviceError(f"設備操作失敗: {last_exception}") from last_exception
         elif isinstance(last_exception, Exception):
-            raise EncoderSystemError(f"操作失敗: {last_exception}")
+            raise EncoderSystemError(f"操作失敗: {last_exception}") from last_exception
     
     # 返回值表示失敗但沒有拋出異常的情況
     raise EncoderSystemError("操作多次重試後仍然失敗", 1001)
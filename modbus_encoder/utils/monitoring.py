@@ -36,7 +36,7 @@ class ConnectionMonitor:
         self.running = False
         self.monitor_thread = None
         self.retry_count = 0
-        self.last_connection_time = 0
+        self.last_connection_time = time.monotonic() - 60  # 單調時鐘時間，僅用於計算間隔；初值使首次檢查立即執行
         self.connection_listeners = []
         
     def start(self):
@@ -114,7 +114,7 @@ class ConnectionMonitor:
                 if connected:
                     logger.info("設備重新連接成功")
                     self.retry_count = 0
-                    self.last_connection_time = time.time()
+                    self.last_connection_time = time.monotonic()
                     self._notify_listeners(True)
                 else:
                     logger.warning(f"設備重新連接失敗 (嘗試 {self.retry_count}/{self.max_retries})")
@@ -129,20 +129,26 @@ class ConnectionMonitor:
                 self._notify_listeners(False, "超過最大重試次數")
                 
             # 但仍然定期嘗試重新連接
-            if (time.time() - self.last_connection_time) > 60:  # 每分鐘嘗試一次
+            if (time.monotonic() - self.last_connection_time) > 60:  # 每分鐘嘗試一次
                 self.retry_count = 1  # 重置計數，重新開始嘗試
 
     def _perform_health_check(self, consecutive_failures, max_failures):
         """執行設備健康檢查"""
+        # 近期已有成功讀取（例如監測循環正在運行）時無需額外探測，避免重複佔用總線
+        last_response_time = getattr(self.device, 'last_response_time', None)
+        if last_response_time is not None and time.monotonic() - last_response_time <= 30:
+            self.last_connection_time = time.monotonic()
+            return
+            
         # 每30秒執行一次健康檢查
-        if hasattr(self.device, 'read_register') and time.time() - self.last_connection_time > 30:
+        if hasattr(self.device, 'read_register') and time.monotonic() - self.last_connection_time > 30:
             try:
                 # 讀取編碼器地址寄存器作為健康檢查
                 result = self.device.read_register(RegisterAddress.ENCODER_SINGLE_VALUE)
                 if result is not None:
                     # 健康檢查成功
                     consecutive_failures = 0
-                    self.last_connection_time = time.time()
+                    self.last_connection_time = time.monotonic()
                 else:
                     # 健康檢查失敗
                     consecutive_failures += 1
@@ -6,11 +6,20 @@
 import time
 import logging
 import threading
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, Callable
 from ..utils.error_handling import safe_call
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class _ResourceEntry:
+    """資源條目，時間欄位為單調時鐘納秒整數"""
+    object: Any
+    ref_count: int
+    create_time: int
+    last_access: int
+
 class ResourceManager:
     """資源管理器類，使用引用計數管理共享資源"""
     
@@ -29,25 +38,25 @@ class ResourceManager:
         Returns:
             資源對象
         """
+        # 時間以單調時鐘的納秒整數記錄，只在統計時換算為秒
+        now = time.monotonic_ns()
+        
         with self.lock:
-            if resource_name not in self.resources:
+            entry = self.resources.get(resource_name)
+            if entry is None:
                 if creator is None:
                     raise ValueError(f"資源 {resource_name} 不存在且未提供創建函數")
                 
                 # 創建資源
-                self.resources[resource_name] = {
-                    "object": creator(),
-                    "ref_count": 0,
-                    "create_time": time.time()
-                }
+                entry = self.resources[resource_name] = _ResourceEntry(creator(), 0, now, now)
                 
             # 增加引用計數
-            self.resources[resource_name]["ref_count"] += 1
-            self.resources[resource_name]["last_access"] = time.time()
+            entry.ref_count += 1
+            entry.last_access = now
             
-            logger.debug(f"獲取資源 {resource_name}，引用計數: {self.resources[resource_name]['ref_count']}")
+            logger.debug("獲取資源 %s，引用計數: %d", resource_name, entry.ref_count)
             
-            return self.resources[resource_name]["object"]
+            return entry.object
             
     def release(self, resource_name: str, cleanup: Callable = None) -> bool:
         """釋放資源
@@ -60,27 +69,28 @@ class ResourceManager:
             是否成功釋放
         """
         with self.lock:
-            if resource_name not in self.resources:
+            entry = self.resources.get(resource_name)
+            if entry is None:
                 logger.warning(f"嘗試釋放不存在的資源: {resource_name}")
                 return False
                 
             # 減少引用計數
-            self.resources[resource_name]["ref_count"] -= 1
-            ref_count = self.resources[resource_name]["ref_count"]
+            entry.ref_count -= 1
+            ref_count = entry.ref_count
             
-            logger.debug(f"釋放資源 {resource_name}，剩餘引用計數: {ref_count}")
+            logger.debug("釋放資源 %s，剩餘引用計數: %d", resource_name, ref_count)
             
             # 如果引用計數為0，則清理資源
             if ref_count <= 0:
                 if cleanup:
                     try:
-                        cleanup(self.resources[resource_name]["object"])
+                        cleanup(entry.object)
                     except Exception as e:
                         logger.error(f"清理資源 {resource_name} 時出錯: {e}")
                 
                 # 移除資源
                 del self.resources[resource_name]
-                logger.info(f"資源 {resource_name} 已清理並移除")
+                logger.info("資源 %s 已清理並移除", resource_name)
                 
             return True
     
@@ -90,13 +100,15 @@ class ResourceManager:
         Returns:
             資源統計信息字典
         """
+        now = time.monotonic_ns()
+        
         with self.lock:
             stats = {}
             for name, info in self.resources.items():
                 stats[name] = {
-                    "ref_count": info["ref_count"],
-                    "age": time.time() - info["create_time"],
-                    "last_access": time.time() - info.get("last_access", info["create_time"])
+                    "ref_count": info.ref_count,
+                    "age": (now - info.create_time) / 1e9,
+                    "last_access": (now - info.last_access) / 1e9
                 }
             return stats
 
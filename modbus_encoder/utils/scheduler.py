@@ -0,0 +1,93 @@
+"""
+延遲任務調度模組
+
+以單一後台線程執行延遲任務，取代每個任務各自建立線程並睡眠等待
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+# 配置日誌
+logger = logging.getLogger(__name__)
+
+
+class DeferredScheduler:
+    """延遲任務調度器
+
+    任務按到期時間存放於最小堆，由單一守護線程在到期時執行；
+    新任務加入時以條件變量喚醒線程重新計算等待時間
+    """
+
+    def __init__(self, name: str = "DeferredScheduler"):
+        """初始化調度器
+
+        Args:
+            name: 後台線程名稱
+        """
+        self.name = name
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def call_later(self, delay: float, func: Callable, *args: Any) -> None:
+        """在指定延遲後執行函數
+
+        Args:
+            delay: 延遲時間(秒)
+            func: 要執行的函數
+            *args: 函數參數
+        """
+        deadline = time.monotonic() + max(0.0, delay)
+
+        with self._condition:
+            heapq.heappush(self._queue, (deadline, next(self._counter), func, args))
+
+            # 首次使用時才啟動後台線程
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+
+            self._condition.notify()
+
+    def shutdown(self) -> None:
+        """停止調度器，丟棄尚未執行的任務"""
+        with self._condition:
+            self._running = False
+            self._queue.clear()
+            self._condition.notify()
+
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self) -> None:
+        """後台線程工作函數"""
+        while True:
+            with self._condition:
+                while self._running:
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+
+                    remaining = self._queue[0][0] - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if not self._running:
+                    return
+
+                _, _, func, args = heapq.heappop(self._queue)
+
+            # 在鎖外執行任務，避免阻塞新任務的加入
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"執行延遲任務出錯: {e}")
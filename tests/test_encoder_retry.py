@@ -0,0 +1,50 @@
+"""
+EncoderController.execute_with_retry 的失敗判斷測試
+"""
+import pytest
+
+from modbus_encoder.controllers.encoder_controller import EncoderController
+
+
+@pytest.fixture
+def controller():
+    """未連接的編碼器控制器"""
+    return EncoderController()
+
+
+def test_status_dict_is_returned_as_is(controller):
+    """狀態字典不論狀態為何都原樣返回，不會重試"""
+    calls = []
+
+    def func():
+        calls.append(1)
+        return {"status": "error", "message": "設備忙"}
+
+    assert controller.execute_with_retry(func, max_retries=2) == {"status": "error", "message": "設備忙"}
+    assert len(calls) == 1
+
+
+def test_single_element_tuple_is_success(controller):
+    """單元素元組視為成功"""
+    assert controller.execute_with_retry(lambda: (False,), max_retries=2) == (False,)
+
+
+def test_failed_result_tuple_exhausts_retries(controller):
+    """首元素為 False 的結果元組重試耗盡後返回失敗元組"""
+    calls = []
+
+    def func():
+        calls.append(1)
+        return (False, "讀取失敗")
+
+    assert controller.execute_with_retry(func, max_retries=1) == (False, "操作重試失敗")
+    assert len(calls) == 2
+
+
+def test_original_exception_is_raised(controller):
+    """重試耗盡後拋出原始異常"""
+    def func():
+        raise KeyError("register")
+
+    with pytest.raises(KeyError):
+        controller.execute_with_retry(func, max_retries=0)
@@ -0,0 +1,81 @@
+"""
+GPIO控制器測試
+
+在沒有 RPi.GPIO 的環境下以模擬模式運行
+"""
+import time
+
+import pytest
+
+from modbus_encoder.controllers.gpio_controller import GPIOController
+
+
+PULSE_DURATION = 0.05
+
+
+@pytest.fixture
+def gpio():
+    """已初始化的GPIO控制器"""
+    controller = GPIOController()
+    assert controller.initialize(output_pins=[17, 27, 22], input_pin=18, enable_event_detect=False)
+    yield controller
+    controller.cleanup()
+
+
+def test_pulse_ends_low(gpio):
+    """脈衝到期後引腳恢復低電位"""
+    assert gpio.pulse_output(0, PULSE_DURATION)
+    assert gpio.pin_states[17] is True
+
+    time.sleep(PULSE_DURATION * 4)
+
+    assert gpio.pin_states[17] is False
+    assert gpio.hardware_gpio._pin_states[17] is False
+
+
+def test_set_output_during_pulse_is_kept(gpio):
+    """脈衝期間明確設置的高電位不會被脈衝結束覆蓋"""
+    assert gpio.pulse_output(0, PULSE_DURATION)
+    assert gpio.set_output(0, True)
+
+    time.sleep(PULSE_DURATION * 4)
+
+    assert gpio.pin_states[17] is True
+    assert gpio.hardware_gpio._pin_states[17] is True
+
+
+def test_toggle_output_during_pulse_is_kept(gpio):
+    """脈衝期間切換後的狀態不會被脈衝結束覆蓋"""
+    assert gpio.pulse_output(0, PULSE_DURATION)
+    assert gpio.toggle_output(0) is False
+    assert gpio.toggle_output(0) is True
+
+    time.sleep(PULSE_DURATION * 4)
+
+    assert gpio.pin_states[17] is True
+    assert gpio.hardware_gpio._pin_states[17] is True
+
+
+def test_pulse_end_event_fires(gpio):
+    """正常結束的脈衝觸發 on_pulse_end"""
+    events = []
+    gpio.register_event_listener("on_pulse_end", events.append)
+    assert gpio.pulse_output(0, PULSE_DURATION)
+
+    time.sleep(PULSE_DURATION * 4)
+
+    assert [event["pin"] for event in events] == [17]
+
+
+def test_superseded_pulse_has_no_end_event(gpio):
+    """被 set_output/toggle_output 取代的脈衝不觸發 on_pulse_end"""
+    events = []
+    gpio.register_event_listener("on_pulse_end", events.append)
+    assert gpio.pulse_output(0, PULSE_DURATION)
+    assert gpio.set_output(0, True)
+    assert gpio.pulse_output(1, PULSE_DURATION)
+    assert gpio.toggle_output(1) is False
+
+    time.sleep(PULSE_DURATION * 4)
+
+    assert events == []
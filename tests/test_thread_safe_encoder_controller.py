@@ -0,0 +1,42 @@
+"""
+ThreadSafeEncoderController 屬性轉發測試
+"""
+from modbus_encoder.controllers.encoder_controller import ThreadSafeEncoderController
+
+
+class FakeEncoder:
+    """只提供轉發所需成員的替身編碼器"""
+
+    def __init__(self, name):
+        self.name = name
+        self.connected = False
+
+    def describe(self):
+        return self.name
+
+
+def test_plain_attribute_is_returned():
+    """非可調用屬性直接返回其值，且不被緩存"""
+    wrapper = ThreadSafeEncoderController(FakeEncoder("a"))
+
+    assert wrapper.connected is False
+    wrapper.encoder_controller.connected = True
+    assert wrapper.connected is True
+    assert "connected" not in wrapper.__dict__
+
+
+def test_method_is_wrapped():
+    """方法經包裝後仍返回原方法的結果"""
+    wrapper = ThreadSafeEncoderController(FakeEncoder("a"))
+
+    assert wrapper.describe() == "a"
+
+
+def test_reassigned_controller_is_used():
+    """更換控制器後，已緩存的方法轉發到新控制器"""
+    wrapper = ThreadSafeEncoderController(FakeEncoder("a"))
+    assert wrapper.describe() == "a"
+
+    wrapper.encoder_controller = FakeEncoder("b")
+
+    assert wrapper.describe() == "b"